@@ -0,0 +1,40 @@
+"""
+size and encode/decode time of the binary protocol encoding, compared to json
+
+usage: python bench/bench_binary.py [--repeat N]
+"""
+
+import argparse
+import timeit
+
+from protocols import make_protocol
+
+from seaconfig import AcquisitionConfig, decode_binary, encode_binary, read_binary_header
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20, help="number of repetitions per measurement (minimum is reported)")
+    args = parser.parse_args()
+
+    def best_ms(function, number: int = 10) -> float:
+        return min(timeit.repeat(function, number=number, repeat=args.repeat)) / number * 1e3
+
+    print(f"{'wells':>6} {'format':>7} {'size [B]':>10} {'encode [ms]':>12} {'decode [ms]':>12}")
+    for num_wells in (96, 384, 1536):
+        config = make_protocol(num_wells)
+        json_data = config.model_dump_json()
+        binary_data = encode_binary(config)
+        assert decode_binary(binary_data) == config
+
+        rows = {
+            "json": (len(json_data), best_ms(config.model_dump_json), best_ms(lambda: AcquisitionConfig.model_validate_json(json_data))),
+            "binary": (len(binary_data), best_ms(lambda: encode_binary(config)), best_ms(lambda: decode_binary(binary_data))),
+        }
+        for name, (size, encode_ms, decode_ms) in rows.items():
+            print(f"{num_wells:>6} {name:>7} {size:>10} {encode_ms:12.3f} {decode_ms:12.3f}")
+
+        header_us = min(timeit.repeat(lambda: read_binary_header(binary_data), number=100, repeat=args.repeat)) / 100 * 1e6
+        print(f"{num_wells:>6} reading the selection bitsets only (read_binary_header): {header_us:.1f} us")
+
+if __name__ == "__main__":
+    main()
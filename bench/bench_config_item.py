@@ -0,0 +1,82 @@
+"""
+per-read cost of the typed ConfigItem properties (intvalue, floatvalue, boolvalue, strvalue)
+
+compares the cached properties of ConfigItem with a copy of the previous implementation, which checked
+(and for floatvalue, converted) the value on every read.
+
+usage: python bench/bench_config_item.py [--number N]
+"""
+
+import typing as tp
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pydantic import BaseModel
+
+from seaconfig import ConfigItem, ConfigItemOption
+
+class LegacyConfigItem(BaseModel):
+    " typed properties of ConfigItem before caching, for comparison "
+
+    name: str
+    handle: str
+    value_kind: str
+    value: tp.Union[int, float, str]
+
+    @property
+    def strvalue(self) -> str:
+        assert isinstance(self.value, str), f"{self.value = } ; on ${self.handle} {type(self.value) = }!=str"
+        return self.value
+
+    @property
+    def intvalue(self) -> int:
+        assert self.value_kind == "int" and isinstance(self.value, int), (
+            f"{self.value = } ; on ${self.handle} {self.value_kind}!='int' or {type(self.value) = }!=int"
+        )
+        return self.value
+
+    @property
+    def floatvalue(self) -> float:
+        if isinstance(self.value, int) and self.value_kind == "float":
+            self.value = float(self.value)
+
+        assert self.value_kind == "float" and isinstance(self.value, float), (
+            f"{self.value = } ; on ${self.handle} {self.value_kind}!='float' or {type(self.value) = }!=float"
+        )
+        return self.value
+
+    @property
+    def boolvalue(self) -> bool:
+        assert isinstance(self.value, str), f"{self.value = } ; on ${self.handle} {type(self.value) = }!=bool"
+        return self.value == "yes"
+
+ITEMS = {
+    "intvalue": dict(name="i", handle="i", value_kind="int", value=3),
+    "floatvalue": dict(name="f", handle="f", value_kind="float", value=3),
+    "boolvalue": dict(name="b", handle="b", value_kind="option", value="yes"),
+    "strvalue": dict(name="s", handle="s", value_kind="text", value="text"),
+}
+
+def per_read_ns(item, prop: str, number: int) -> float:
+    seconds = min(timeit.repeat(f"item.{prop}", globals={"item": item}, number=number, repeat=5))
+    return seconds / number * 1e9
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=200_000, help="number of reads per measurement")
+    args = parser.parse_args()
+
+    print(f"{'property':>12} {'before [ns]':>12} {'after [ns]':>12} {'speedup':>8}")
+    for prop, fields in ITEMS.items():
+        legacy = LegacyConfigItem(**fields)
+        item = ConfigItem(**fields, options=ConfigItemOption.get_bool_options() if fields["value_kind"] == "option" else None)
+        before = per_read_ns(legacy, prop, args.number)
+        after = per_read_ns(item, prop, args.number)
+        print(f"{prop:>12} {before:12.1f} {after:12.1f} {before / after:7.1f}x")
+
+if __name__ == "__main__":
+    main()
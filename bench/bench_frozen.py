@@ -0,0 +1,89 @@
+"""
+memory and attribute access of the frozen mirror types (seaconfig.frozen), compared with the pydantic models
+
+measures:
+    - memory : memory allocated per protocol, for many independently loaded 1536-well protocols. the frozen
+      protocols are measured starting with empty intern caches, so the interned values count too: once for the first
+      protocol, and amortized over all protocols
+    - conversion : time for FrozenAcquisitionConfig.from_model on one protocol
+    - attribute access : time per read of a nested attribute (config.wellplate_type.Well_distance_x_mm) and of
+      plate_wells[i].selected over all wells
+
+usage: python bench/bench_frozen.py [--num-protocols N] [--number N]
+"""
+
+import argparse
+import gc
+import timeit
+import tracemalloc
+
+from protocols import make_protocol
+
+from seaconfig import AcquisitionConfig, FrozenAcquisitionConfig
+from seaconfig import frozen as frozen_module
+
+def clear_intern_caches():
+    " forget all interned values, so that the next conversion allocates them again "
+    frozen_module._intern_wellplate.cache_clear()
+    frozen_module._intern_plate_well.cache_clear()
+    frozen_module._intern_site.cache_clear()
+    frozen_module._intern_option.cache_clear()
+
+def allocated_bytes(create, count: int) -> float:
+    " bytes allocated per object, when keeping count objects created by create "
+    gc.collect()
+    tracemalloc.start()
+    objects = [create() for _ in range(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size / count
+
+def per_op_ns(statement, number: int) -> float:
+    return min(timeit.repeat(statement, number=number, repeat=5)) / number * 1e9
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num-protocols", type=int, default=20, help="number of protocols kept in memory")
+    parser.add_argument("--number", type=int, default=200_000, help="number of reads per measurement")
+    args = parser.parse_args()
+
+    data = make_protocol(1536).model_dump_json()
+    config = AcquisitionConfig.model_validate_json(data)
+    frozen = FrozenAcquisitionConfig.from_model(config)
+
+    def load_frozen():
+        return FrozenAcquisitionConfig.from_model(AcquisitionConfig.model_validate_json(data))
+
+    pydantic_bytes = allocated_bytes(lambda: AcquisitionConfig.model_validate_json(data), args.num_protocols)
+    # `frozen` above already filled the intern caches, which would hide the memory of the interned values
+    clear_intern_caches()
+    first_frozen_bytes = allocated_bytes(load_frozen, 1)
+    clear_intern_caches()
+    frozen_bytes = allocated_bytes(load_frozen, args.num_protocols)
+    print(f"memory per protocol: pydantic {pydantic_bytes / 1024:.0f} KiB, frozen {frozen_bytes / 1024:.0f} KiB ({pydantic_bytes / frozen_bytes:.1f}x smaller)")
+    print(f"memory of the first frozen protocol (including all interned values): {first_frozen_bytes / 1024:.0f} KiB")
+
+    conversion_ms = per_op_ns(lambda: FrozenAcquisitionConfig.from_model(config), 20) * 1e-6
+    print(f"conversion: {conversion_ms:.2f} ms per protocol")
+
+    print(f"{'access':>24} {'pydantic [ns]':>14} {'frozen [ns]':>12} {'speedup':>8}")
+    nested = {
+        "nested attribute": (
+            lambda: config.wellplate_type.Well_distance_x_mm,
+            lambda: frozen.wellplate_type.Well_distance_x_mm,
+            args.number,
+        ),
+        "all wells .selected": (
+            lambda: [well.selected for well in config.plate_wells],
+            lambda: [well.selected for well in frozen.plate_wells],
+            100,
+        ),
+    }
+    for name, (read_pydantic, read_frozen, number) in nested.items():
+        before = per_op_ns(read_pydantic, number)
+        after = per_op_ns(read_frozen, number)
+        print(f"{name:>24} {before:14.1f} {after:12.1f} {before / after:7.1f}x")
+
+if __name__ == "__main__":
+    main()
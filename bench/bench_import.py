@@ -0,0 +1,53 @@
+"""
+import time benchmark for short lived processes
+
+measures, in fresh interpreters:
+    - import : `import seaconfig`, i.e. what a worker process that never touches the plate catalog pays
+    - catalog : first access to seaconfig.Plates afterwards, which creates all Wellplate instances
+                (this used to be paid by every import, when the catalog was created eagerly)
+
+usage: python bench/bench_import.py [--repeat N]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import typing as tp
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+CODE = """
+import time
+t0 = time.perf_counter()
+import seaconfig
+t1 = time.perf_counter()
+seaconfig.Plates
+t2 = time.perf_counter()
+print(t1 - t0, t2 - t1)
+"""
+
+def measure() -> tp.Tuple[float, float]:
+    " import seaconfig in a fresh interpreter, return (import time, catalog creation time) in seconds "
+    out = subprocess.run([sys.executable, "-c", CODE], cwd=REPO_ROOT, check=True, capture_output=True, text=True).stdout
+    import_s, catalog_s = out.split()
+    return float(import_s), float(catalog_s)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20, help="number of fresh interpreters")
+    args = parser.parse_args()
+
+    import_times, catalog_times = zip(*(measure() for _ in range(args.repeat)))
+    import_ms = statistics.median(import_times) * 1e3
+    catalog_ms = statistics.median(catalog_times) * 1e3
+
+    print(f"median of {args.repeat} fresh interpreters")
+    print(f"{'import':>16}: {import_ms:8.2f} ms")
+    print(f"{'catalog':>16}: {catalog_ms:8.2f} ms (first access to seaconfig.Plates)")
+    print(f"{'import+catalog':>16}: {import_ms + catalog_ms:8.2f} ms (previous cost of every import)")
+    print(f"startup gain for processes that do not use the plate catalog: {catalog_ms / (import_ms + catalog_ms) * 100:.2f}%")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+protocol loading benchmark, on a 1536-well protocol
+
+compares:
+    - cold : AcquisitionConfig.model_validate_json, i.e. full parse and validation (what every load used to cost)
+    - warm (content) : ProtocolLoader.load on a file whose content is cached, with trust_file_stat=False (read + hash)
+    - warm (stat) : ProtocolLoader.load on an unchanged file whose content is cached (stat only)
+
+usage: python bench/bench_loading.py [--repeat N]
+"""
+
+import argparse
+import tempfile
+import timeit
+from pathlib import Path
+
+from protocols import make_protocol
+
+from seaconfig import AcquisitionConfig, ProtocolLoader
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=50, help="number of loads per measurement")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "protocol.json"
+        path.write_text(make_protocol(1536).model_dump_json())
+        print(f"protocol size: {path.stat().st_size / 1024:.0f} KiB")
+
+        content_loader = ProtocolLoader(trust_file_stat=False)
+        stat_loader = ProtocolLoader()
+        content_loader.load(path)
+        stat_loader.load(path)
+
+        cases = {
+            "cold": lambda: AcquisitionConfig.model_validate_json(path.read_bytes()),
+            "warm (content)": lambda: content_loader.load(path),
+            "warm (stat)": lambda: stat_loader.load(path),
+        }
+        for name, case in cases.items():
+            seconds = min(timeit.repeat(case, number=1, repeat=args.repeat))
+            print(f"{name:>16}: {seconds * 1e3:8.3f} ms")
+
+if __name__ == "__main__":
+    main()
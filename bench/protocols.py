@@ -0,0 +1,83 @@
+"""
+synthetic protocols for benchmarks
+"""
+
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from seaconfig import (
+    AcquisitionChannelConfig,
+    AcquisitionConfig,
+    AcquisitionWellSiteConfiguration,
+    AcquisitionWellSiteConfigurationDeltaTime,
+    AcquisitionWellSiteConfigurationSiteSelectionItem,
+    ConfigItem,
+    ConfigItemOption,
+    PlateWellConfig,
+    plate_registry,
+)
+
+def make_protocol(num_wells: int = 1536, num_sites_xy: int = 5, num_channels: int = 5, num_config_items: int = 50) -> AcquisitionConfig:
+    """
+    protocol on the first known plate with num_wells wells, with all wells and all num_sites_xy*num_sites_xy sites selected
+    """
+
+    plate = plate_registry.find_by_num_wells(num_wells)[0]
+
+    return AcquisitionConfig(
+        project_name="benchmark",
+        plate_name=f"benchmark-{num_wells}",
+        cell_line="none",
+        grid=AcquisitionWellSiteConfiguration(
+            num_x=num_sites_xy,
+            delta_x_mm=0.9 * plate.Well_size_x_mm / num_sites_xy,
+            num_y=num_sites_xy,
+            delta_y_mm=0.9 * plate.Well_size_y_mm / num_sites_xy,
+            num_t=10,
+            delta_t=AcquisitionWellSiteConfigurationDeltaTime(h=1, m=0, s=0),
+            mask=[
+                AcquisitionWellSiteConfigurationSiteSelectionItem(row=row, col=col, selected=True)
+                for row in range(num_sites_xy)
+                for col in range(num_sites_xy)
+            ],
+        ),
+        wellplate_type=plate,
+        plate_wells=[
+            PlateWellConfig(row=row, col=col, selected=True)
+            for row in range(plate.Num_wells_y)
+            for col in range(plate.Num_wells_x)
+        ],
+        channels=[
+            AcquisitionChannelConfig(
+                name=f"channel {i}",
+                handle=f"channel_{i}",
+                illum_perc=50,
+                exposure_time_ms=10 + i,
+                analog_gain=0,
+                z_offset_um=0,
+                num_z_planes=3,
+                delta_z_um=1.5,
+                filter_handle=f"filter_{i % 2}",
+            )
+            for i in range(num_channels)
+        ],
+        autofocus_enabled=True,
+        machine_config=[
+            [
+                ConfigItem(name=f"int {i}", handle=f"int_{i}", value_kind="int", value=i),
+                ConfigItem(name=f"float {i}", handle=f"float_{i}", value_kind="float", value=i * 0.5),
+                ConfigItem(name=f"text {i}", handle=f"text_{i}", value_kind="text", value=f"text {i}"),
+                ConfigItem(
+                    name=f"option {i}",
+                    handle=f"option_{i}",
+                    value_kind="option",
+                    value="yes",
+                    options=ConfigItemOption.get_bool_options(),
+                ),
+            ][i % 4]
+            for i in range(num_config_items)
+        ],
+    )
@@ -0,0 +1,181 @@
+"""
+benchmark suite for seaconfig hot paths
+
+all results are time per operation in seconds (lower is better), as the minimum over several repetitions.
+
+usage:
+    python bench/suite.py --output results.json
+        run all benchmarks and write the results
+    python bench/suite.py --compare baseline.json [--threshold 0.1]
+        run all benchmarks and compare with earlier results. exits with status 1 if any benchmark is slower than
+        in the baseline by more than threshold (relative, i.e. 0.1 = 10%)
+    python bench/suite.py --filter roundtrip
+        only run benchmarks whose name contains the filter
+"""
+
+import typing as tp
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+from datetime import datetime, timedelta, timezone
+
+from protocols import REPO_ROOT, make_protocol
+
+import seaconfig
+from seaconfig import AcquisitionConfig, ConfigItem, ConfigItemOption, FrozenAcquisitionConfig, PlateRegistry, Version, datetime2str
+from seaconfig.plates import _PLATE_DATA
+
+Benchmark = tp.Callable[[int], float]
+
+BENCHMARKS: tp.Dict[str, Benchmark] = {}
+
+def benchmark(name: str) -> tp.Callable[[Benchmark], Benchmark]:
+    " register a benchmark. the function gets the number of repetitions, and returns the time per operation [s] "
+    def decorator(function: Benchmark) -> Benchmark:
+        BENCHMARKS[name] = function
+        return function
+    return decorator
+
+def time_per_op(statement: tp.Callable[[], tp.Any], number: int, repeat: int) -> float:
+    return min(timeit.repeat(statement, number=number, repeat=repeat)) / number
+
+@benchmark("import_seaconfig")
+def _import(repeat: int) -> float:
+    code = "import time; t0 = time.perf_counter(); import seaconfig; print(time.perf_counter() - t0)"
+    times = [
+        float(subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, check=True, capture_output=True, text=True).stdout)
+        for _ in range(max(repeat, 5))
+    ]
+    return statistics.median(times)
+
+@benchmark("plates_construction")
+def _plates_construction(repeat: int) -> float:
+    return time_per_op(lambda: PlateRegistry(_PLATE_DATA).plates, number=20, repeat=repeat)
+
+def _roundtrip_benchmark(num_wells: int) -> Benchmark:
+    def run(repeat: int) -> float:
+        config = make_protocol(num_wells)
+        return time_per_op(lambda: AcquisitionConfig.model_validate_json(config.model_dump_json()), number=5, repeat=repeat)
+    return run
+
+for _num_wells in (96, 384, 1536):
+    benchmark(f"json_roundtrip_{_num_wells}")(_roundtrip_benchmark(_num_wells))
+
+@benchmark("freeze_config_1536")
+def _freeze_config(repeat: int) -> float:
+    config = make_protocol(1536)
+    return time_per_op(lambda: FrozenAcquisitionConfig.from_model(config), number=20, repeat=repeat)
+
+@benchmark("well_offset_xy")
+def _well_offset(repeat: int) -> float:
+    plate = seaconfig.plate_registry.find_by_num_wells(1536)[0]
+    names = [f"{row}{col}" for row in ("A", "P", "AF") for col in (1, 24, 48)]
+
+    def run():
+        for name in names:
+            plate.get_well_offset_x(name)
+            plate.get_well_offset_y(name)
+
+    return time_per_op(run, number=1000, repeat=repeat) / (2 * len(names))
+
+@benchmark("config_item_typed_read")
+def _config_item_read(repeat: int) -> float:
+    items = [
+        ConfigItem(name="i", handle="i", value_kind="int", value=3),
+        ConfigItem(name="f", handle="f", value_kind="float", value=3),
+        ConfigItem(name="o", handle="o", value_kind="option", value="yes", options=ConfigItemOption.get_bool_options()),
+        ConfigItem(name="s", handle="s", value_kind="text", value="text"),
+    ]
+    int_item, float_item, option_item, text_item = items
+
+    def run():
+        int_item.intvalue
+        float_item.floatvalue
+        option_item.boolvalue
+        text_item.strvalue
+
+    return time_per_op(run, number=50_000, repeat=repeat) / len(items)
+
+@benchmark("version_smaller_than")
+def _version_smaller_than(repeat: int) -> float:
+    versions = [Version(major=6, minor=minor, patch=patch) for minor in range(3) for patch in range(3)]
+    pairs = [(a, b) for a in versions for b in versions]
+
+    def run():
+        for a, b in pairs:
+            a.smaller_than(b)
+
+    return time_per_op(run, number=1000, repeat=repeat) / len(pairs)
+
+@benchmark("datetime2str")
+def _datetime2str(repeat: int) -> float:
+    # 10 timestamps per second, like a camera taking images at 10 fps
+    start = datetime(2024, 1, 31, 12, 0, 0, tzinfo=timezone.utc)
+    times = [start + timedelta(milliseconds=100 * i) for i in range(1000)]
+
+    def run():
+        for dt in times:
+            datetime2str(dt)
+
+    return time_per_op(run, number=10, repeat=repeat) / len(times)
+
+def compare(results: tp.Dict[str, float], baseline: tp.Dict[str, float], threshold: float) -> tp.List[str]:
+    " print comparison table, return names of benchmarks that regressed by more than threshold "
+    regressions = []
+    print(f"{'benchmark':<26} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, value in results.items():
+        if name not in baseline:
+            print(f"{name:<26} {'-':>12} {value:12.3e} {'new':>8}")
+            continue
+
+        change = value / baseline[name] - 1
+        regressed = change > threshold
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<26} {baseline[name]:12.3e} {value:12.3e} {change:+7.1%}{'  REGRESSION' if regressed else ''}")
+
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", help="write results to this json file")
+    parser.add_argument("--compare", help="compare with results in this json file")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative slowdown that counts as regression (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=7, help="number of repetitions per benchmark (default: %(default)s)")
+    parser.add_argument("--filter", default="", help="only run benchmarks with names containing this")
+    args = parser.parse_args()
+
+    results: tp.Dict[str, float] = {}
+    for name, run in BENCHMARKS.items():
+        if args.filter in name:
+            results[name] = run(args.repeat)
+            if not args.compare:
+                print(f"{name:<26} {results[name]:12.3e} s")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(
+                {
+                    "python": sys.version,
+                    "platform": platform.platform(),
+                    "unit": "s/op",
+                    "results": results,
+                },
+                file,
+                indent=2,
+            )
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) above {args.threshold:.0%}: {', '.join(regressions)}")
+            raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
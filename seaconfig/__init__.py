@@ -1,4 +1,28 @@
 from .acquisition import *
 from .config_item import *
 from .wellplates import *
+from .wellnames import *
 from .plates import *
+from .plan import *
+from .pathing import *
+from .loading import *
+from .selection import *
+from .diff import *
+from .binary import *
+from .estimate import *
+from .validation import *
+from .schedule import *
+from .timepoints import *
+from .frozen import *
+from .timestamps import *
+
+def __getattr__(name: str):
+    # forward lazily created module attributes (which are not picked up by the star imports above)
+    if name == "Plates":
+        from .plates import plate_registry
+        return plate_registry.plates
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# keep Plates in star imports of this package. it is only created when a star import actually happens.
+__all__ = [name for name in globals() if not name.startswith("_")] + ["Plates"]
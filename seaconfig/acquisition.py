@@ -1,7 +1,12 @@
 import typing as tp
+import json
+import time
+from . import instrumentation
 from .config_item import ConfigItem
-from .wellplates import Wellplate
-from pydantic import BaseModel, Field
+from .wellplates import Wellplate, WellplateReference
+from .wellnames import well_name
+from .plates import plate_registry
+from pydantic import BaseModel, Field, field_validator
 
 class AcquisitionWellSiteConfigurationDeltaTime(BaseModel):
     "delta time struct with hour,minute and second components. used for delta t spec in "
@@ -85,7 +90,7 @@ class PlateWellConfig(BaseModel):
 
     @property
     def well_name(self)->str:
-        return f"{chr(ord('A')+self.row)}{self.col+1}"
+        return well_name(self.row,self.col)
 
 class Version(BaseModel):
     "semantic version number (see https://semver.org/ for details)"
@@ -131,3 +136,84 @@ class AcquisitionConfig(BaseModel):
 
     timestamp:tp.Optional[str]=None
     " creation timestamp of this protocol in utc "
+
+    @field_validator("wellplate_type",mode="before")
+    @classmethod
+    def _resolve_wellplate_reference(cls,value:tp.Any)->tp.Any:
+        """
+        wellplate_type may also be given as WellplateReference (or its dict), which resolves to a copy of the catalog
+        plate, without validating the plate again.
+        """
+
+        if isinstance(value,dict) and "content_hash" in value:
+            value=WellplateReference.model_validate(value)
+        if not isinstance(value,WellplateReference):
+            return value
+
+        plate=plate_registry.resolve(value.Model_id,value.content_hash)
+        if plate is not None:
+            return plate
+        if value.fallback is not None:
+            return value.fallback
+        raise ValueError(f"wellplate reference {value.Model_id!r} does not match any known plate, and has no fallback")
+
+    # instrumentation (see seaconfig.instrumentation). pydantic validators on fields would make pydantic convert the
+    # input to python objects first (slowing down validation even with instrumentation disabled), so validation is
+    # measured here instead, and the time per field is measured by validating each field separately.
+    _INSTRUMENTED_FIELDS:tp.ClassVar[tp.Tuple[str,...]]=("grid","wellplate_type","plate_wells","channels","machine_config")
+
+    @classmethod
+    def _record_field_validation(cls,recorder:"instrumentation.Recorder",data:tp.Any):
+        if not isinstance(data,dict):
+            return
+        for name in cls._INSTRUMENTED_FIELDS:
+            if name not in data:
+                continue
+            start_time=time.perf_counter()
+            try:
+                cls.__pydantic_validator__.validate_assignment(cls.model_construct(),name,data[name])
+            except ValueError:
+                continue
+            recorder.record(f"validate.{name}",time.perf_counter()-start_time)
+
+    @classmethod
+    def model_validate_json(cls,json_data:tp.Union[str,bytes,bytearray],**kwargs:tp.Any)->"AcquisitionConfig":
+        recorder=instrumentation.recorder
+        if recorder is None:
+            return super().model_validate_json(json_data,**kwargs)
+
+        recorder.record("validate.json_bytes",len(json_data))
+        with recorder.timer("validate.AcquisitionConfig"):
+            config=super().model_validate_json(json_data,**kwargs)
+        if recorder.validation_breakdown:
+            cls._record_field_validation(recorder,json.loads(json_data))
+        return config
+
+    @classmethod
+    def model_validate(cls,obj:tp.Any,**kwargs:tp.Any)->"AcquisitionConfig":
+        recorder=instrumentation.recorder
+        if recorder is None:
+            return super().model_validate(obj,**kwargs)
+
+        with recorder.timer("validate.AcquisitionConfig"):
+            config=super().model_validate(obj,**kwargs)
+        if recorder.validation_breakdown:
+            cls._record_field_validation(recorder,obj)
+        return config
+
+    def model_dump_json_with_plate_reference(self,embed_fallback:bool=False,indent:tp.Optional[int]=None)->str:
+        """
+        like model_dump_json, but if wellplate_type is identical to a plate in the catalog (seaconfig.plates.plate_registry),
+        it is written as WellplateReference instead of the full plate. the result can be loaded with model_validate_json.
+
+        if embed_fallback is True, the reference includes a full copy of the plate, which is used on load if the
+        catalog plate has changed in the meantime.
+        """
+
+        reference=plate_registry.reference(self.wellplate_type,embed_fallback=embed_fallback)
+        if reference is None:
+            return self.model_dump_json(indent=indent)
+
+        data=self.model_dump(mode="json")
+        data["wellplate_type"]=reference.model_dump(mode="json",exclude_none=True)
+        return json.dumps(data,indent=indent,separators=(",",":") if indent is None else None,ensure_ascii=False)
@@ -0,0 +1,319 @@
+"""
+append-only archive of many protocol files, with an index for searching them without parsing every protocol
+
+an archive is a directory containing:
+    - data.bin : protocol json, one record after the other. records are only ever appended.
+    - index.json : one entry per record (position in data.bin, content hash, and the searchable fields
+      project_name, plate_name, cell_line, wellplate_type.Model_id and timestamp), and the size, modification time and
+      content hash of every ingested source file.
+
+queries only use the index. data.bin is memory mapped, and a protocol is only parsed when it is loaded (see
+ProtocolArchive.load). identical protocols are stored once, no matter how many source files contain them.
+
+run as `python -m seaconfig.archive build <archive> <directory or files>` to ingest protocol files (unchanged files
+are skipped), and `python -m seaconfig.archive query <archive> [--project ..]` to search an archive.
+
+an archive must only be written by one process at a time.
+"""
+
+import typing as tp
+import argparse
+import bisect
+import json
+import mmap
+import os
+import time
+from pathlib import Path
+
+from pydantic import ValidationError
+
+from .acquisition import AcquisitionConfig
+from .batch_validation import format_validation_errors, iter_protocol_files
+from .loading import content_hash
+from .migration import migrate, needs_migration, peek_spec_version, write_atomic
+
+ARCHIVE_FORMAT_VERSION = 1
+
+class ArchiveEntry(tp.NamedTuple):
+    """
+    one protocol in an archive
+
+    Fields:
+        offset:int - position of the protocol json in data.bin [bytes]
+        length:int - size of the protocol json [bytes]
+        hash:str - content hash (see seaconfig.loading.content_hash) of the protocol json
+        source:str - path of the file the protocol was first ingested from
+        project_name:str
+        plate_name:str
+        cell_line:str
+        model_id:str - wellplate_type.Model_id
+        timestamp:tp.Optional[str]
+    """
+
+    offset: int
+    length: int
+    hash: str
+    source: str
+    project_name: str
+    plate_name: str
+    cell_line: str
+    model_id: str
+    timestamp: tp.Optional[str]
+
+class IngestResult(tp.NamedTuple):
+    """
+    Fields:
+        path:str - source file
+        status:str - one of "unchanged" (skipped, same as when it was last ingested), "added" (new record),
+            "duplicate" (file is new or changed, but its content is already in the archive), "failed"
+        error:tp.Optional[str] - error message, if status is "failed"
+    """
+
+    path: str
+    status: tp.Literal["unchanged", "added", "duplicate", "failed"]
+    error: tp.Optional[str] = None
+
+class ProtocolArchive:
+    """
+    see module docstring
+
+    creates the archive directory if it does not exist.
+    """
+
+    def __init__(self, root: tp.Union[str, Path]):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.data_path = self.root / "data.bin"
+        self.index_path = self.root / "index.json"
+
+        self.entries: tp.List[ArchiveEntry] = []
+        " all records, in the order they were added "
+        self._sources: tp.Dict[str, tp.Dict[str, tp.Any]] = {}
+        self._by_hash: tp.Dict[str, int] = {}
+        self._by_field: tp.Dict[str, tp.Dict[tp.Any, tp.List[int]]] = {}
+        self._by_timestamp: tp.List[tp.Tuple[str, int]] = []
+
+        self._mmap: tp.Optional[mmap.mmap] = None
+
+        if self.index_path.exists():
+            index = json.loads(self.index_path.read_bytes())
+            if index["version"] != ARCHIVE_FORMAT_VERSION:
+                raise ValueError(f"unsupported archive format version {index['version']} (expected {ARCHIVE_FORMAT_VERSION})")
+            self._sources = index["sources"]
+            for record in index["records"]:
+                self._add_entry(ArchiveEntry(*record))
+
+    _FIELDS: tp.ClassVar[tp.Tuple[str, ...]] = ("project_name", "plate_name", "cell_line", "model_id")
+
+    def _add_entry(self, entry: ArchiveEntry):
+        i = len(self.entries)
+        self.entries.append(entry)
+        self._by_hash[entry.hash] = i
+        for field in self._FIELDS:
+            self._by_field.setdefault(field, {}).setdefault(getattr(entry, field), []).append(i)
+        if entry.timestamp is not None:
+            bisect.insort(self._by_timestamp, (entry.timestamp, i))
+
+    def _save_index(self):
+        index = {
+            "version": ARCHIVE_FORMAT_VERSION,
+            "records": [list(entry) for entry in self.entries],
+            "sources": self._sources,
+        }
+        write_atomic(self.index_path, json.dumps(index).encode("utf-8"))
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def find(
+        self,
+        project_name: tp.Optional[str] = None,
+        plate_name: tp.Optional[str] = None,
+        cell_line: tp.Optional[str] = None,
+        model_id: tp.Optional[str] = None,
+        timestamp_from: tp.Optional[str] = None,
+        timestamp_to: tp.Optional[str] = None,
+    ) -> tp.List[ArchiveEntry]:
+        """
+        entries matching all given arguments (in the order they were added). arguments that are None are ignored.
+
+        timestamps are compared as strings, which orders them correctly for the protocol timestamp format
+        (YYYY-MM-DD_HH.MM.SS). timestamp_from and timestamp_to are inclusive. entries without timestamp do not match
+        a timestamp range.
+        """
+
+        candidates: tp.Optional[tp.Set[int]] = None
+        for field, value in zip(self._FIELDS, (project_name, plate_name, cell_line, model_id)):
+            if value is None:
+                continue
+            matches = set(self._by_field.get(field, {}).get(value, ()))
+            candidates = matches if candidates is None else candidates & matches
+
+        if timestamp_from is not None or timestamp_to is not None:
+            start = 0 if timestamp_from is None else bisect.bisect_left(self._by_timestamp, (timestamp_from, -1))
+            stop = len(self._by_timestamp) if timestamp_to is None else bisect.bisect_right(self._by_timestamp, (timestamp_to, len(self.entries)))
+            matches = {i for _, i in self._by_timestamp[start:stop]}
+            candidates = matches if candidates is None else candidates & matches
+
+        if candidates is None:
+            return list(self.entries)
+        return [self.entries[i] for i in sorted(candidates)]
+
+    def _data(self) -> tp.Union[mmap.mmap, bytes]:
+        if self._mmap is None:
+            if not self.data_path.exists() or self.data_path.stat().st_size == 0:
+                return b""
+            with open(self.data_path, "rb") as file:
+                self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap
+
+    def read(self, entry: ArchiveEntry) -> bytes:
+        " protocol json of entry "
+        return self._data()[entry.offset:entry.offset + entry.length]
+
+    def load(self, entry: ArchiveEntry) -> AcquisitionConfig:
+        " parse and validate the protocol of entry "
+        return AcquisitionConfig.model_validate_json(self.read(entry))
+
+    def iter_load(self, entries: tp.Iterable[ArchiveEntry]) -> tp.Iterator[tp.Tuple[ArchiveEntry, AcquisitionConfig]]:
+        " load protocols one at a time, e.g. for the results of find "
+        for entry in entries:
+            yield entry, self.load(entry)
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> "ProtocolArchive":
+        return self
+
+    def __exit__(self, *exc_info: tp.Any):
+        self.close()
+
+    def _ingest_file(self, path: Path, data_file: tp.BinaryIO) -> IngestResult:
+        source = str(path.resolve())
+        stat = path.stat()
+        known = self._sources.get(source)
+        if known is not None and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns:
+            return IngestResult(str(path), "unchanged")
+
+        data = path.read_bytes()
+        digest = content_hash(data)
+        if known is not None and known["hash"] == digest:
+            self._sources[source] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "hash": digest}
+            return IngestResult(str(path), "unchanged")
+
+        if needs_migration(peek_spec_version(data)):
+            config = AcquisitionConfig.model_validate(migrate(json.loads(data)))
+            data = config.model_dump_json().encode("utf-8")
+        else:
+            config = AcquisitionConfig.model_validate_json(data)
+        record_hash = content_hash(data)
+
+        self._sources[source] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "hash": digest}
+        if record_hash in self._by_hash:
+            return IngestResult(str(path), "duplicate")
+
+        offset = data_file.seek(0, os.SEEK_END)
+        data_file.write(data)
+        self._add_entry(ArchiveEntry(
+            offset,
+            len(data),
+            record_hash,
+            source,
+            config.project_name,
+            config.plate_name,
+            config.cell_line,
+            config.wellplate_type.Model_id,
+            config.timestamp,
+        ))
+        return IngestResult(str(path), "added")
+
+    def ingest(self, paths: tp.Iterable[tp.Union[str, Path]], pattern: str = "*.json") -> tp.Iterator[IngestResult]:
+        """
+        add protocol files (directories are searched recursively for files matching pattern) to the archive
+
+        files with the same size and modification time as when they were last ingested are skipped without being read,
+        and files with the same content are skipped without being parsed. protocols with an older spec version are
+        migrated (see seaconfig.migration) before they are stored.
+
+        data.bin is synced before the index is written, so an interrupted ingest never leaves index entries that point
+        to missing data.
+        """
+
+        self.close()
+        with open(self.data_path, "ab") as data_file:
+            try:
+                for path in iter_protocol_files(paths, pattern):
+                    try:
+                        yield self._ingest_file(path, data_file)
+                    except ValidationError as e:
+                        yield IngestResult(str(path), "failed", "; ".join(format_validation_errors(e)))
+                    except (OSError, ValueError) as e:
+                        yield IngestResult(str(path), "failed", f"{type(e).__name__}: {e}")
+            finally:
+                # also when interrupted (exception, or the caller closing the generator early)
+                data_file.flush()
+                os.fsync(data_file.fileno())
+                self._save_index()
+
+def main(argv: tp.Optional[tp.List[str]] = None):
+    parser = argparse.ArgumentParser(prog="python -m seaconfig.archive", description="build and search protocol archives")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="add protocol files to an archive (unchanged files are skipped)")
+    build.add_argument("archive", type=Path, help="archive directory (created if it does not exist)")
+    build.add_argument("paths", nargs="+", type=Path, help="protocol files, or directories containing protocol files")
+    build.add_argument("--pattern", default="*.json", help="glob pattern of protocol files in directories (default: %(default)s)")
+
+    query = commands.add_parser("query", help="list archived protocols matching all given filters")
+    query.add_argument("archive", type=Path, help="archive directory")
+    query.add_argument("--project", help="project_name")
+    query.add_argument("--plate", help="plate_name")
+    query.add_argument("--cell-line", help="cell_line")
+    query.add_argument("--model-id", help="wellplate_type.Model_id")
+    query.add_argument("--from", dest="timestamp_from", help="earliest timestamp (inclusive), e.g. 2024-01-31_00.00.00")
+    query.add_argument("--to", dest="timestamp_to", help="latest timestamp (inclusive)")
+    query.add_argument("--json", action="store_true", help="print one json object per entry")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        archive = ProtocolArchive(args.archive)
+        counts = {"unchanged": 0, "added": 0, "duplicate": 0, "failed": 0}
+        start_time = time.perf_counter()
+        for result in archive.ingest(args.paths, args.pattern):
+            counts[result.status] += 1
+            if result.status == "failed":
+                print(f"failed: {result.path}: {result.error}")
+        duration_s = time.perf_counter() - start_time
+
+        print(
+            f"{sum(counts.values())} files in {duration_s:.2f}s: {counts['added']} added, {counts['duplicate']} duplicate, "
+            f"{counts['unchanged']} unchanged, {counts['failed']} failed ({len(archive)} protocols in archive)"
+        )
+        if counts["failed"] > 0:
+            raise SystemExit(1)
+
+    elif args.command == "query":
+        if not (args.archive / "index.json").exists():
+            parser.error(f"{args.archive} is not an archive")
+
+        archive = ProtocolArchive(args.archive)
+        entries = archive.find(
+            project_name=args.project,
+            plate_name=args.plate,
+            cell_line=args.cell_line,
+            model_id=args.model_id,
+            timestamp_from=args.timestamp_from,
+            timestamp_to=args.timestamp_to,
+        )
+        for entry in entries:
+            if args.json:
+                print(json.dumps(entry._asdict()))
+            else:
+                print(f"{entry.timestamp or '-'}  {entry.project_name}/{entry.plate_name}  {entry.cell_line}  {entry.model_id}  {entry.source}")
+
+if __name__ == "__main__":
+    main()
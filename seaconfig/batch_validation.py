@@ -0,0 +1,165 @@
+"""
+validation of many protocol files in parallel
+
+run as `python -m seaconfig.batch_validation <directory or files>` to validate protocol files and check their
+wellplate_type against the known plates (see seaconfig.plates).
+"""
+
+import typing as tp
+import argparse
+import json
+import multiprocessing
+import time
+from pathlib import Path
+
+from pydantic import ValidationError
+
+from .acquisition import LATEST_SPEC_VERSION, AcquisitionConfig, Version
+from .migration import peek_spec_version
+from .plates import plate_registry
+
+WellplateMatch = tp.Literal["match", "differs", "unknown"]
+"""
+result of comparing the wellplate_type of a protocol with the known plates:
+    - match : a known plate has the same Model_id, and is identical
+    - differs : a known plate has the same Model_id, but different values (e.g. the plate definition was updated since the protocol was written)
+    - unknown : no known plate has this Model_id
+"""
+
+class FileValidationResult(tp.NamedTuple):
+    """
+    Fields:
+        path:str - protocol file
+        ok:bool - True if the file is a valid AcquisitionConfig (independent of wellplate_match)
+        errors:tp.List[str] - validation errors, as "<location>: <message>"
+        spec_version:tp.Optional[Version] - spec version of the protocol, if it could be read
+        wellplate_model_id:tp.Optional[str] - Model_id of the wellplate_type of the protocol, if the file is valid
+        wellplate_match:tp.Optional[WellplateMatch] - see WellplateMatch, if the file is valid
+    """
+
+    path: str
+    ok: bool
+    errors: tp.List[str]
+    spec_version: tp.Optional[Version] = None
+    wellplate_model_id: tp.Optional[str] = None
+    wellplate_match: tp.Optional[WellplateMatch] = None
+
+def format_validation_errors(error: ValidationError) -> tp.List[str]:
+    " one line per error in error, e.g. 'grid.num_x: Input should be a valid integer' "
+    return [f"{'.'.join(str(loc) for loc in e['loc']) or '<root>'}: {e['msg']}" for e in error.errors()]
+
+def match_wellplate(config: AcquisitionConfig) -> WellplateMatch:
+    known_plate = plate_registry.get(config.wellplate_type.Model_id)
+    if known_plate is None:
+        return "unknown"
+    if known_plate != config.wellplate_type:
+        return "differs"
+    return "match"
+
+def validate_file(path: tp.Union[str, Path]) -> FileValidationResult:
+    " validate one protocol file, and compare its wellplate_type with the known plates "
+
+    path = Path(path)
+    try:
+        data = path.read_bytes()
+    except OSError as e:
+        return FileValidationResult(str(path), False, [f"<file>: {e}"])
+
+    try:
+        config = AcquisitionConfig.model_validate_json(data)
+    except ValidationError as e:
+        try:
+            spec_version = peek_spec_version(data)
+        except (ValueError, ValidationError):
+            spec_version = None
+        return FileValidationResult(str(path), False, format_validation_errors(e), spec_version)
+
+    errors = []
+    if LATEST_SPEC_VERSION.smaller_than(config.spec_version):
+        errors.append(f"spec_version: {config.spec_version} is newer than supported {LATEST_SPEC_VERSION}")
+
+    return FileValidationResult(
+        str(path),
+        len(errors) == 0,
+        errors,
+        config.spec_version,
+        config.wellplate_type.Model_id,
+        match_wellplate(config),
+    )
+
+def _init_worker():
+    # create the plate catalog once per worker, instead of once per file
+    plate_registry.plates
+
+def iter_protocol_files(paths: tp.Iterable[tp.Union[str, Path]], pattern: str = "*.json") -> tp.Iterator[Path]:
+    " files in paths, where directories are searched recursively for files matching pattern "
+    for path in map(Path, paths):
+        if path.is_dir():
+            yield from (file for file in path.rglob(pattern) if file.is_file())
+        else:
+            yield path
+
+def validate_files(
+    paths: tp.Iterable[tp.Union[str, Path]],
+    num_workers: tp.Optional[int] = None,
+    chunksize: int = 16,
+) -> tp.Iterator[FileValidationResult]:
+    """
+    validate protocol files using a pool of num_workers processes (defaults to the number of cpus)
+
+    files are sent to the workers in chunks of chunksize, and results are yielded as they complete (in any order).
+    """
+
+    with multiprocessing.Pool(num_workers, initializer=_init_worker) as pool:
+        yield from pool.imap_unordered(validate_file, paths, chunksize=chunksize)
+
+def main(argv: tp.Optional[tp.List[str]] = None):
+    parser = argparse.ArgumentParser(
+        prog="python -m seaconfig.batch_validation",
+        description="validate protocol files, and compare their wellplate_type with the known plates",
+    )
+    parser.add_argument("paths", nargs="+", type=Path, help="protocol files, or directories containing protocol files")
+    parser.add_argument("--pattern", default="*.json", help="glob pattern of protocol files in directories (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes (default: number of cpus)")
+    parser.add_argument("--chunksize", type=int, default=16, help="number of files sent to a worker at once (default: %(default)s)")
+    parser.add_argument("--json", action="store_true", help="print one json object per file, instead of only the problems")
+    args = parser.parse_args(argv)
+
+    counts = {"ok": 0, "invalid": 0, "plate_differs": 0, "plate_unknown": 0}
+    start_time = time.perf_counter()
+    for result in validate_files(iter_protocol_files(args.paths, args.pattern), num_workers=args.workers, chunksize=args.chunksize):
+        counts["ok" if result.ok else "invalid"] += 1
+        if result.wellplate_match == "differs":
+            counts["plate_differs"] += 1
+        elif result.wellplate_match == "unknown":
+            counts["plate_unknown"] += 1
+
+        if args.json:
+            record = result._asdict()
+            record["spec_version"] = result.spec_version.model_dump() if result.spec_version is not None else None
+            print(json.dumps(record), flush=True)
+        else:
+            for error in result.errors:
+                print(f"invalid: {result.path}: {error}")
+            if result.wellplate_match in ("differs", "unknown"):
+                print(f"wellplate {result.wellplate_match}: {result.path}: {result.wellplate_model_id}")
+    duration_s = time.perf_counter() - start_time
+
+    num_files = counts["ok"] + counts["invalid"]
+    summary = (
+        f"{num_files} files in {duration_s:.2f}s ({num_files / max(duration_s, 1e-9):.0f} files/s): "
+        f"{counts['ok']} ok, {counts['invalid']} invalid, "
+        f"wellplate_type differs from known plate in {counts['plate_differs']}, unknown in {counts['plate_unknown']}"
+    )
+    if args.json:
+        print(json.dumps({"summary": summary}))
+    else:
+        print(summary)
+
+    if counts["invalid"] > 0:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    # run main from the imported module (not from __main__), so that worker processes refer to the same module
+    from seaconfig.batch_validation import main as _main
+    _main()
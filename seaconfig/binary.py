@@ -0,0 +1,309 @@
+"""
+compact binary encoding of AcquisitionConfig
+
+layout (all integers little endian):
+    - header (see _HEADER): magic b"SEAC", format version, flags, spec_version of the protocol, well and site grid
+      shapes, and the lengths of the following sections
+    - well selection bitset (see SelectionBitmap.to_bytes), if plate_wells is stored as bitset
+    - site selection bitset, if grid.mask is stored as bitset
+    - body: all other fields, in msgpack encoding (a subset of it: nil, bool, int, float64, str, array, map)
+
+plate_wells and grid.mask are stored as bitsets if they contain exactly one item per grid cell, in row-major order
+(which is how they are usually created). otherwise they are stored in the body, so that decoding always returns
+the original config.
+"""
+
+import typing as tp
+import struct
+
+from .acquisition import LATEST_SPEC_VERSION, AcquisitionConfig, Version
+from .selection import SelectionBitmap
+
+BINARY_FORMAT_VERSION = 1
+" version of the binary layout (independent of the spec version of the encoded protocol) "
+
+_MAGIC = b"SEAC"
+_HEADER = struct.Struct("<4sBBHHHHHHHIII")
+_FLAG_WELLS_BITSET = 1
+_FLAG_SITES_BITSET = 2
+
+# --- msgpack subset
+
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+def _pack(value: tp.Any, out: bytearray):
+    if value is None:
+        out.append(0xC0)
+    elif value is True:
+        out.append(0xC3)
+    elif value is False:
+        out.append(0xC2)
+    elif isinstance(value, int):
+        if 0 <= value < 0x80:
+            out.append(value)
+        elif -0x20 <= value < 0:
+            out.append(value & 0xFF)
+        elif _INT64_MIN <= value <= _INT64_MAX:
+            out += b"\xd3" + struct.pack(">q", value)
+        else:
+            raise ValueError(f"cannot encode integer {value}, only 64 bit signed integers are supported")
+    elif isinstance(value, float):
+        out += b"\xcb" + struct.pack(">d", value)
+    elif isinstance(value, str):
+        data = value.encode("utf-8")
+        length = len(data)
+        if length < 0x20:
+            out.append(0xA0 | length)
+        elif length < 0x100:
+            out += struct.pack(">BB", 0xD9, length)
+        elif length < 0x10000:
+            out += struct.pack(">BH", 0xDA, length)
+        else:
+            out += struct.pack(">BI", 0xDB, length)
+        out += data
+    elif isinstance(value, (list, tuple)):
+        length = len(value)
+        if length < 0x10:
+            out.append(0x90 | length)
+        elif length < 0x10000:
+            out += struct.pack(">BH", 0xDC, length)
+        else:
+            out += struct.pack(">BI", 0xDD, length)
+        for item in value:
+            _pack(item, out)
+    elif isinstance(value, dict):
+        length = len(value)
+        if length < 0x10:
+            out.append(0x80 | length)
+        elif length < 0x10000:
+            out += struct.pack(">BH", 0xDE, length)
+        else:
+            out += struct.pack(">BI", 0xDF, length)
+        for key, item in value.items():
+            _pack(key, out)
+            _pack(item, out)
+    else:
+        raise TypeError(f"cannot encode value of type {type(value).__name__}")
+
+def _unpack(data: memoryview, pos: int) -> tp.Tuple[tp.Any, int]:
+    " decode value at data[pos:], returns value and position after it "
+    tag = data[pos]
+    pos += 1
+
+    if tag < 0x80:
+        return tag, pos
+    if tag >= 0xE0:
+        return tag - 0x100, pos
+    if 0xA0 <= tag <= 0xBF:
+        end = pos + (tag & 0x1F)
+        return str(data[pos:end], "utf-8"), end
+    if 0x90 <= tag <= 0x9F:
+        return _unpack_array(data, pos, tag & 0x0F)
+    if 0x80 <= tag <= 0x8F:
+        return _unpack_map(data, pos, tag & 0x0F)
+
+    if tag == 0xC0:
+        return None, pos
+    if tag == 0xC2:
+        return False, pos
+    if tag == 0xC3:
+        return True, pos
+    if tag == 0xD3:
+        return struct.unpack_from(">q", data, pos)[0], pos + 8
+    if tag == 0xCB:
+        return struct.unpack_from(">d", data, pos)[0], pos + 8
+    if tag in (0xD9, 0xDA, 0xDB):
+        length_format = {0xD9: ">B", 0xDA: ">H", 0xDB: ">I"}[tag]
+        length = struct.unpack_from(length_format, data, pos)[0]
+        pos += struct.calcsize(length_format)
+        return str(data[pos : pos + length], "utf-8"), pos + length
+    if tag in (0xDC, 0xDD):
+        length_format = ">H" if tag == 0xDC else ">I"
+        length = struct.unpack_from(length_format, data, pos)[0]
+        return _unpack_array(data, pos + struct.calcsize(length_format), length)
+    if tag in (0xDE, 0xDF):
+        length_format = ">H" if tag == 0xDE else ">I"
+        length = struct.unpack_from(length_format, data, pos)[0]
+        return _unpack_map(data, pos + struct.calcsize(length_format), length)
+
+    raise ValueError(f"unsupported type tag 0x{tag:02x} at position {pos - 1}")
+
+def _unpack_array(data: memoryview, pos: int, length: int) -> tp.Tuple[tp.List[tp.Any], int]:
+    ret = []
+    for _ in range(length):
+        item, pos = _unpack(data, pos)
+        ret.append(item)
+    return ret, pos
+
+def _unpack_map(data: memoryview, pos: int, length: int) -> tp.Tuple[tp.Dict[tp.Any, tp.Any], int]:
+    ret = {}
+    for _ in range(length):
+        key, pos = _unpack(data, pos)
+        ret[key], pos = _unpack(data, pos)
+    return ret, pos
+
+# --- AcquisitionConfig
+
+class BinaryHeader(tp.NamedTuple):
+    """
+    header of a binary encoded AcquisitionConfig
+
+    Fields:
+        format_version:int - see BINARY_FORMAT_VERSION
+        spec_version:Version - spec_version of the encoded protocol
+        well_rows,well_cols:int - shape of the well selection bitset
+        site_rows,site_cols:int - shape of the site selection bitset
+        wells:tp.Optional[memoryview] - well selection bitset (view into the encoded data), None if plate_wells is stored in the body
+        sites:tp.Optional[memoryview] - site selection bitset (view into the encoded data), None if grid.mask is stored in the body
+        body:memoryview - msgpack encoded remaining fields (view into the encoded data)
+    """
+
+    format_version: int
+    spec_version: Version
+    well_rows: int
+    well_cols: int
+    site_rows: int
+    site_cols: int
+    wells: tp.Optional[memoryview]
+    sites: tp.Optional[memoryview]
+    body: memoryview
+
+def _is_full_grid(items: tp.List[tp.Any], num_rows: int, num_cols: int) -> bool:
+    " True if items contains exactly one item per grid cell, in row-major order "
+    if len(items) != num_rows * num_cols:
+        return False
+    return all(item.row == i // num_cols and item.col == i % num_cols for i, item in enumerate(items))
+
+def encode_binary(config: AcquisitionConfig) -> bytes:
+    " encode config (see module documentation for the format). raises ValueError for integers outside of the 64 bit range (e.g. in ConfigItemOption.info) "
+
+    plate = config.wellplate_type
+    grid = config.grid
+
+    flags = 0
+    exclude: tp.Dict[str, tp.Any] = {}
+
+    wells = b""
+    if _is_full_grid(config.plate_wells, plate.Num_wells_y, plate.Num_wells_x):
+        flags |= _FLAG_WELLS_BITSET
+        wells = SelectionBitmap.from_items(plate.Num_wells_y, plate.Num_wells_x, config.plate_wells).to_bytes()
+        exclude["plate_wells"] = True
+
+    sites = b""
+    if _is_full_grid(grid.mask, grid.num_y, grid.num_x):
+        flags |= _FLAG_SITES_BITSET
+        sites = SelectionBitmap.from_items(grid.num_y, grid.num_x, grid.mask).to_bytes()
+        exclude["grid"] = {"mask"}
+
+    body = config.model_dump(mode="json", exclude=exclude)
+
+    packed_body = bytearray()
+    _pack(body, packed_body)
+
+    spec_version = config.spec_version
+    header = _HEADER.pack(
+        _MAGIC,
+        BINARY_FORMAT_VERSION,
+        flags,
+        spec_version.major,
+        spec_version.minor,
+        spec_version.patch,
+        plate.Num_wells_y,
+        plate.Num_wells_x,
+        grid.num_y,
+        grid.num_x,
+        len(wells),
+        len(sites),
+        len(packed_body),
+    )
+    return header + wells + sites + packed_body
+
+def read_binary_header(data: tp.Union[bytes, bytearray, memoryview]) -> BinaryHeader:
+    """
+    read header of binary encoded config, without decoding the body
+
+    the selection bitsets and the body are returned as memoryviews into data, i.e. they are not copied.
+    """
+
+    view = memoryview(data)
+    if len(view) < _HEADER.size:
+        raise ValueError("data is too short to be a binary encoded AcquisitionConfig")
+
+    (
+        magic,
+        format_version,
+        flags,
+        major,
+        minor,
+        patch,
+        well_rows,
+        well_cols,
+        site_rows,
+        site_cols,
+        wells_length,
+        sites_length,
+        body_length,
+    ) = _HEADER.unpack_from(view)
+
+    if magic != _MAGIC:
+        raise ValueError("data is not a binary encoded AcquisitionConfig")
+    if format_version != BINARY_FORMAT_VERSION:
+        raise ValueError(f"unsupported binary format version {format_version} (supported: {BINARY_FORMAT_VERSION})")
+
+    pos = _HEADER.size
+    wells = view[pos : pos + wells_length] if flags & _FLAG_WELLS_BITSET else None
+    pos += wells_length
+    sites = view[pos : pos + sites_length] if flags & _FLAG_SITES_BITSET else None
+    pos += sites_length
+    body = view[pos : pos + body_length]
+    if len(body) != body_length:
+        raise ValueError("binary encoded AcquisitionConfig is truncated")
+
+    return BinaryHeader(
+        format_version=format_version,
+        spec_version=Version(major=major, minor=minor, patch=patch),
+        well_rows=well_rows,
+        well_cols=well_cols,
+        site_rows=site_rows,
+        site_cols=site_cols,
+        wells=wells,
+        sites=sites,
+        body=body,
+    )
+
+def _selection_items(num_rows: int, num_cols: int, bits: memoryview) -> tp.List[tp.Dict[str, tp.Any]]:
+    " selection bitset to list of (unvalidated) PlateWellConfig/AcquisitionWellSiteConfigurationSiteSelectionItem dicts "
+    selected = [bool(byte >> bit & 1) for byte in bits for bit in range(8)]
+    return [
+        {"row": row, "col": col, "selected": selected[row * num_cols + col]}
+        for row in range(num_rows)
+        for col in range(num_cols)
+    ]
+
+def decode_binary(data: tp.Union[bytes, bytearray, memoryview]) -> AcquisitionConfig:
+    """
+    decode config encoded by encode_binary
+
+    protocols with an older spec_version are upgraded (see seaconfig.migration) before validation.
+    raises ValueError if the spec_version is newer than LATEST_SPEC_VERSION.
+    """
+
+    header = read_binary_header(data)
+    if LATEST_SPEC_VERSION.smaller_than(header.spec_version):
+        raise ValueError(f"protocol spec version {header.spec_version} is newer than supported {LATEST_SPEC_VERSION}")
+
+    body, _ = _unpack(header.body, 0)
+
+    if header.wells is not None:
+        body["plate_wells"] = _selection_items(header.well_rows, header.well_cols, header.wells)
+    if header.sites is not None:
+        body["grid"]["mask"] = _selection_items(header.site_rows, header.site_cols, header.sites)
+
+    # imported here, so that importing seaconfig does not import the migration tool (and its multiprocessing setup)
+    from .migration import migrate, needs_migration
+
+    if needs_migration(header.spec_version):
+        body = migrate(body)
+
+    return AcquisitionConfig.model_validate(body)
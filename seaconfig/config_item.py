@@ -1,7 +1,15 @@
 import typing as tp
-from datetime import datetime, timezone
+import functools
+from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
+
+from .timestamps import TimestampFormatter
+
+if tp.TYPE_CHECKING:
+    from .acquisition import AcquisitionConfig
+
+_timestamp_formatter = TimestampFormatter()
 
 
 def datetime2str(dt: datetime) -> str:
@@ -11,9 +19,8 @@ def datetime2str(dt: datetime) -> str:
     also converts the timezone to utc
     """
 
-    # Convert to UTC and format as YYYY-MM-DD_HH.MM.SS
-    utc_dt = dt.astimezone(timezone.utc)
-    return utc_dt.strftime("%Y-%m-%d_%H.%M.%S")
+    # formatted as YYYY-MM-DD_HH.MM.SS, cached per second (see seaconfig.timestamps)
+    return _timestamp_formatter.format(dt)
 
 
 class ConfigItemOption(BaseModel):
@@ -43,31 +50,62 @@ class ConfigItem(BaseModel):
     frozen: bool = False
     options: tp.Optional[tp.List[ConfigItemOption]] = None
 
-    @property
+    # the typed values are checked on first read and then cached in the instance __dict__, so that subsequent reads
+    # are plain attribute lookups. the cache is invalidated when value or value_kind change (see __setattr__).
+    _TYPED_VALUES: tp.ClassVar[tp.Tuple[str, ...]] = ("strvalue", "intvalue", "floatvalue", "boolvalue")
+
+    @model_validator(mode="after")
+    def _validate_value(self) -> "ConfigItem":
+        self._on_value_changed()
+        return self
+
+    def __setattr__(self, name: str, value: tp.Any):
+        super().__setattr__(name, value)
+
+        if name in ("value", "value_kind"):
+            self._on_value_changed()
+
+    def _on_value_changed(self):
+        # float values may be written as int (e.g. 1 instead of 1.0)
+        if self.value_kind == "float" and isinstance(self.value, int):
+            self.__dict__["value"] = float(self.value)
+
+        for name in self._TYPED_VALUES:
+            self.__dict__.pop(name, None)
+
+    def model_copy(self, *, update: tp.Optional[tp.Dict[str, tp.Any]] = None, deep: bool = False) -> "ConfigItem":
+        # update is applied to __dict__ directly, bypassing __setattr__
+        copied = super().model_copy(update=update, deep=deep)
+        if update:
+            copied._on_value_changed()
+        return copied
+
+    @functools.cached_property
     def strvalue(self) -> str:
         assert isinstance(self.value, str), (
             f"{self.value = } ; on ${self.handle} {type(self.value) = }!=str"
         )
         return self.value
 
-    @property
+    @functools.cached_property
     def intvalue(self) -> int:
         assert self.value_kind=="int" and isinstance(self.value, int), (
             f"{self.value = } ; on ${self.handle} {self.value_kind}!='int' or {type(self.value) = }!=int"
         )
         return self.value
 
-    @property
+    @functools.cached_property
     def floatvalue(self) -> float:
-        if isinstance(self.value, int) and self.value_kind=="float":
-            self.value=float(self.value)
+        # items created without validation (e.g. with model_construct) have not been coerced yet
+        if self.value_kind == "float" and isinstance(self.value, int):
+            self.__dict__["value"] = float(self.value)
 
         assert self.value_kind=="float" and isinstance(self.value, float), (
             f"{self.value = } ; on ${self.handle} {self.value_kind}!='float' or {type(self.value) = }!=float"
         )
         return self.value
 
-    @property
+    @functools.cached_property
     def boolvalue(self) -> bool:
         # from ConfigItemOption.get_bool_options()
         assert isinstance(self.value, str), (
@@ -82,3 +120,114 @@ class ConfigItem(BaseModel):
         assert self.handle == other.handle, f"on ${self.handle} {self.handle = } != {other.handle = }"
         assert self.value_kind == other.value_kind, f"on ${self.handle} {self.value_kind = } != {other.value_kind = }"
         self.value = other.value
+
+class ConfigItemMismatch(tp.NamedTuple):
+    """
+    reason why an item could not be merged into a ConfigItemCollection
+
+    Fields:
+        handle:str - handle of the item
+        reason:str - "unknown" if there is no item with this handle in the collection, "value_kind" if the value kinds differ
+        message:str - human readable description
+    """
+
+    handle: str
+    reason: tp.Literal["unknown", "value_kind"]
+    message: str
+
+class ConfigItemCollection:
+    """
+    ConfigItems indexed by handle, e.g. for AcquisitionConfig.machine_config
+
+    the collection is a view on the list it was created from: items are not copied, so overriding values through the
+    collection changes the items in the list, and items added to the collection are appended to the list.
+
+    if items is None, the collection creates a new list, which is not referenced by anything else (in particular,
+    ConfigItemCollection(config.machine_config) with machine_config None does not change the config when items are
+    added). use for_config for a view on the machine_config of an AcquisitionConfig, or assign collection.items back.
+    """
+
+    def __init__(self, items: tp.Optional[tp.List[ConfigItem]] = None):
+        """
+        raises ValueError if multiple items have the same handle
+        """
+
+        self.items: tp.List[ConfigItem] = items if items is not None else []
+        self._by_handle: tp.Dict[str, ConfigItem] = {}
+        for item in self.items:
+            if item.handle in self._by_handle:
+                raise ValueError(f"duplicate config item handle {item.handle!r}")
+            self._by_handle[item.handle] = item
+
+    @classmethod
+    def for_config(cls, config: "AcquisitionConfig") -> "ConfigItemCollection":
+        """
+        view on config.machine_config (of an AcquisitionConfig). if machine_config is None, it is set to an empty list
+        first, so that items added to the collection are part of the config.
+        """
+
+        if config.machine_config is None:
+            config.machine_config = []
+        return cls(config.machine_config)
+
+    def add(self, item: ConfigItem):
+        if item.handle in self._by_handle:
+            raise ValueError(f"duplicate config item handle {item.handle!r}")
+        self._by_handle[item.handle] = item
+        self.items.append(item)
+
+    def get(self, handle: str) -> tp.Optional[ConfigItem]:
+        return self._by_handle.get(handle)
+
+    def __getitem__(self, handle: str) -> ConfigItem:
+        " raises KeyError if there is no item with this handle "
+        return self._by_handle[handle]
+
+    def __contains__(self, handle: str) -> bool:
+        return handle in self._by_handle
+
+    def __iter__(self) -> tp.Iterator[ConfigItem]:
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def get_int(self, handle: str) -> int:
+        return self._by_handle[handle].intvalue
+
+    def get_float(self, handle: str) -> float:
+        return self._by_handle[handle].floatvalue
+
+    def get_bool(self, handle: str) -> bool:
+        return self._by_handle[handle].boolvalue
+
+    def get_str(self, handle: str) -> str:
+        return self._by_handle[handle].strvalue
+
+    def override_from(self, other: tp.Iterable[ConfigItem]) -> tp.List[ConfigItemMismatch]:
+        """
+        update values from all items in other (e.g. another ConfigItemCollection, or a list of ConfigItem)
+
+        items with a handle that is unknown in this collection, or with a different value_kind, are not merged.
+        they are returned, all together, instead of raising on the first one. all other items are merged.
+        """
+
+        mismatches = []
+        for other_item in other:
+            item = self._by_handle.get(other_item.handle)
+            if item is None:
+                mismatches.append(
+                    ConfigItemMismatch(other_item.handle, "unknown", f"no config item with handle {other_item.handle!r}")
+                )
+            elif item.value_kind != other_item.value_kind:
+                mismatches.append(
+                    ConfigItemMismatch(
+                        other_item.handle,
+                        "value_kind",
+                        f"on {other_item.handle!r} value_kind {item.value_kind!r} != {other_item.value_kind!r}",
+                    )
+                )
+            else:
+                item.override(other_item)
+
+        return mismatches
@@ -0,0 +1,222 @@
+import typing as tp
+
+from pydantic import BaseModel, TypeAdapter
+
+from .acquisition import (
+    AcquisitionChannelConfig,
+    AcquisitionConfig,
+    AcquisitionWellSiteConfigurationSiteSelectionItem,
+    PlateWellConfig,
+)
+from .config_item import ConfigItem
+
+PatchPathItem = tp.Union[tp.Tuple[int, int], str]
+
+class ConfigPatchOperation(BaseModel):
+    """
+    one change to an AcquisitionConfig
+
+    Fields:
+        op:str - "set" to replace the value at path, "add" to add an item to a keyed list, "remove" to remove an item from a keyed list,
+            "move" to reorder the items of a keyed list
+        path:tp.List[PatchPathItem] - location of the value. field names, and for keyed lists, the key of the item:
+            - plate_wells and grid.mask items are keyed by (row,col), e.g. ["plate_wells",[3,5],"selected"]
+            - channels and machine_config items are keyed by handle, e.g. ["channels","fluo405","exposure_time_ms"]
+            for "move", the path ends at the list, e.g. ["channels"]
+        value:tp.Any - new value (for "set" and "add"), or the keys of all items in their new order (for "move"), in json compatible form
+    """
+
+    op: tp.Literal["set", "add", "remove", "move"]
+    path: tp.List[PatchPathItem]
+    value: tp.Any = None
+
+class _KeyedList(tp.NamedTuple):
+    item_type: tp.Type[BaseModel]
+    key: tp.Callable[[tp.Any], PatchPathItem]
+
+_KEYED_LISTS: tp.Dict[tp.Tuple[str, ...], _KeyedList] = {
+    ("plate_wells",): _KeyedList(PlateWellConfig, lambda item: (item.row, item.col)),
+    ("grid", "mask"): _KeyedList(AcquisitionWellSiteConfigurationSiteSelectionItem, lambda item: (item.row, item.col)),
+    ("channels",): _KeyedList(AcquisitionChannelConfig, lambda item: item.handle),
+    ("machine_config",): _KeyedList(ConfigItem, lambda item: item.handle),
+}
+" lists of items that are diffed by key, instead of replaced as a whole "
+
+_NESTED_MODELS: tp.Set[tp.Tuple[str, ...]] = {("grid",)}
+" models that are diffed field by field, instead of replaced as a whole "
+
+_KEYS_ADAPTER = TypeAdapter(tp.List[PatchPathItem])
+" validates the keys of a move operation, e.g. turns [3,5] (from json) back into (3,5) "
+
+def _dump(value: tp.Any) -> tp.Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, list):
+        return [_dump(item) for item in value]
+    return value
+
+def _diff_keyed(
+    old: tp.List[BaseModel],
+    new: tp.List[BaseModel],
+    path: tp.List[PatchPathItem],
+    keyed: _KeyedList,
+    ops: tp.List[ConfigPatchOperation],
+):
+    old_by_key = {keyed.key(item): item for item in old}
+    new_order = [keyed.key(item) for item in new]
+    new_keys = set(new_order)
+    for key, new_item in zip(new_order, new):
+
+        old_item = old_by_key.get(key)
+        if old_item is None:
+            ops.append(ConfigPatchOperation(op="add", path=[*path, key], value=_dump(new_item)))
+            continue
+
+        for name in type(new_item).model_fields:
+            new_value = getattr(new_item, name)
+            if getattr(old_item, name) != new_value:
+                ops.append(ConfigPatchOperation(op="set", path=[*path, key, name], value=_dump(new_value)))
+
+    for key in old_by_key:
+        if key not in new_keys:
+            ops.append(ConfigPatchOperation(op="remove", path=[*path, key]))
+
+    # order after the operations above: remaining items in their old order, then added items
+    patched_order = [key for key in old_by_key if key in new_keys]
+    patched_order.extend(key for key in new_order if key not in old_by_key)
+    if patched_order != new_order:
+        ops.append(ConfigPatchOperation(op="move", path=list(path), value=_dump(new_order)))
+
+def _diff_model(old: BaseModel, new: BaseModel, path: tp.List[PatchPathItem], ops: tp.List[ConfigPatchOperation]):
+    for name in type(new).model_fields:
+        old_value = getattr(old, name)
+        new_value = getattr(new, name)
+        field_path = [*path, name]
+
+        keyed = _KEYED_LISTS.get(tuple(field_path))
+        if keyed is not None and old_value is not None and new_value is not None:
+            _diff_keyed(old_value, new_value, field_path, keyed, ops)
+        elif tuple(field_path) in _NESTED_MODELS:
+            _diff_model(old_value, new_value, field_path, ops)
+        elif old_value != new_value:
+            ops.append(ConfigPatchOperation(op="set", path=field_path, value=_dump(new_value)))
+
+def diff_configs(old: AcquisitionConfig, new: AcquisitionConfig) -> tp.List[ConfigPatchOperation]:
+    """
+    compute the operations that turn old into new (see apply_patch)
+
+    items in keyed lists (see ConfigPatchOperation) are matched by key, so that e.g. toggling a well results in a
+    single operation. added items are appended, and if the order of items differs from new afterwards (e.g. reordered
+    channels), a "move" operation restores it.
+    """
+
+    ops: tp.List[ConfigPatchOperation] = []
+    _diff_model(old, new, [], ops)
+    return ops
+
+def _set_field(model: BaseModel, name: str, value: tp.Any):
+    " set model field to value, validating only that field "
+    if name not in type(model).model_fields:
+        raise ValueError(f"{type(model).__name__} has no field {name!r}")
+
+    model.__pydantic_validator__.validate_assignment(model, name, value)
+    # run the regular assignment (with the validated value), for models that react to it (e.g. ConfigItem)
+    setattr(model, name, getattr(model, name))
+
+def _find_index(items: tp.List[BaseModel], key: PatchPathItem, keyed: _KeyedList, guess: tp.Optional[int]) -> int:
+    " index of item with key in items, or -1. guess is tried first, to avoid scanning lists in their usual order "
+    if guess is not None and 0 <= guess < len(items) and keyed.key(items[guess]) == key:
+        return guess
+    for i, item in enumerate(items):
+        if keyed.key(item) == key:
+            return i
+    return -1
+
+def _move_items(items: tp.List[BaseModel], keys: tp.List[PatchPathItem], keyed: _KeyedList, path: tp.List[PatchPathItem]):
+    " reorder items in place, to the order of keys. keys must contain the key of every item exactly once "
+    by_key = {keyed.key(item): item for item in items}
+    if len(keys) != len(items) or set(keys) != by_key.keys():
+        raise ValueError(f"cannot move items of {path}, keys do not match the items in the list")
+    items[:] = [by_key[key] for key in keys]
+
+def _apply_operation(config: AcquisitionConfig, operation: ConfigPatchOperation):
+    path = operation.path
+    if len(path) == 0:
+        raise ValueError("patch operation path must not be empty")
+
+    parent: BaseModel = config
+    i = 0
+    while True:
+        name = path[i]
+        if not isinstance(name, str):
+            raise ValueError(f"expected field name at {path[: i + 1]}, got {name!r}")
+
+        keyed = _KEYED_LISTS.get(tuple(path[: i + 1]))  # type: ignore[arg-type]
+        if keyed is not None and i + 1 == len(path) and operation.op == "move":
+            items = getattr(parent, name)
+            if items is None:
+                raise ValueError(f"cannot move items of {path}, because {name} is None")
+            _move_items(items, _KEYS_ADAPTER.validate_python(operation.value), keyed, path)
+            return
+
+        if keyed is not None and i + 1 < len(path):
+            items = getattr(parent, name)
+            if items is None:
+                raise ValueError(f"cannot apply patch to {path}, because {name} is None")
+
+            key = path[i + 1]
+            guess = None
+            if name == "plate_wells" and isinstance(key, tuple):
+                guess = key[0] * config.wellplate_type.Num_wells_x + key[1]
+            elif name == "mask" and isinstance(key, tuple):
+                guess = key[0] * config.grid.num_x + key[1]
+            index = _find_index(items, key, keyed, guess)
+
+            if i + 2 == len(path):
+                # operation on the whole item
+                if operation.op == "remove":
+                    if index < 0:
+                        raise ValueError(f"cannot remove {path}, no such item")
+                    del items[index]
+                    return
+
+                item = keyed.item_type.model_validate(operation.value)
+                if keyed.key(item) != key:
+                    raise ValueError(f"key of item {keyed.key(item)!r} does not match path {path}")
+                if operation.op == "add":
+                    if index >= 0:
+                        raise ValueError(f"cannot add {path}, item already exists")
+                    items.append(item)
+                else:
+                    if index < 0:
+                        raise ValueError(f"cannot set {path}, no such item")
+                    items[index] = item
+                return
+
+            if index < 0:
+                raise ValueError(f"cannot apply patch to {path}, no item with key {key!r}")
+            parent = items[index]
+            i += 2
+            continue
+
+        if i + 1 == len(path):
+            if operation.op != "set":
+                raise ValueError(f"operation {operation.op!r} is only valid on keyed list items, not on {path}")
+            _set_field(parent, name, operation.value)
+            return
+
+        parent = getattr(parent, name)
+        if not isinstance(parent, BaseModel):
+            raise ValueError(f"cannot apply patch to {path}, {path[: i + 1]} is not a model")
+        i += 1
+
+def apply_patch(config: AcquisitionConfig, patch: tp.Iterable[ConfigPatchOperation]):
+    """
+    apply operations (e.g. from diff_configs) to config, in place
+
+    only the values touched by an operation are validated, so the cost of small patches does not depend on plate size.
+    operations are applied in order. if an operation fails (raises), the operations before it remain applied.
+    """
+
+    for operation in patch:
+        _apply_operation(config, operation)
@@ -0,0 +1,210 @@
+import typing as tp
+import math
+
+from pydantic import BaseModel
+
+from .acquisition import AcquisitionConfig, AcquisitionWellSiteConfigurationDeltaTime
+from .plan import AcquisitionPlan
+
+class StageModel(tp.Protocol):
+    def move_time_s(self, distance_mm: float) -> float:
+        " time to move the stage by distance_mm (including settling) [s] "
+        ...
+
+class CameraModel(tp.Protocol):
+    def frame_bytes(self) -> int:
+        " size of one image [bytes] "
+        ...
+
+    def frame_time_s(self, exposure_time_ms: float) -> float:
+        " time to take one image with the given exposure time [s] "
+        ...
+
+class OverheadModel(tp.Protocol):
+    def site_overhead_s(self, config: AcquisitionConfig) -> float:
+        " fixed time spent at each site, in addition to stage moves and image acquisition (e.g. autofocus) [s] "
+        ...
+
+    def image_overhead_s(self, config: AcquisitionConfig) -> float:
+        " fixed time spent per image, in addition to the camera frame time (e.g. z moves, channel switching) [s] "
+        ...
+
+class TrapezoidalStageModel(BaseModel):
+    """
+    stage that accelerates with constant acceleration up to max speed, and then decelerates (symmetrically)
+
+    the defaults are placeholders, and should be replaced with values measured on the microscope.
+    """
+
+    max_speed_mm_s: float = 20.0
+    acceleration_mm_s2: float = 200.0
+    settle_time_s: float = 0.01
+
+    def move_time_s(self, distance_mm: float) -> float:
+        if distance_mm <= 0:
+            return 0.0
+
+        # distance needed to reach max speed and stop again
+        ramp_distance_mm = self.max_speed_mm_s**2 / self.acceleration_mm_s2
+        if distance_mm < ramp_distance_mm:
+            move_time_s = 2 * math.sqrt(distance_mm / self.acceleration_mm_s2)
+        else:
+            move_time_s = distance_mm / self.max_speed_mm_s + self.max_speed_mm_s / self.acceleration_mm_s2
+
+        return move_time_s + self.settle_time_s
+
+class SimpleCameraModel(BaseModel):
+    """
+    camera with fixed image size and readout time
+
+    the defaults are placeholders, and should be replaced with the values of the camera in use.
+    """
+
+    width_px: int = 2500
+    height_px: int = 2000
+    bytes_per_pixel: int = 2
+    readout_time_ms: float = 20.0
+
+    def frame_bytes(self) -> int:
+        return self.width_px * self.height_px * self.bytes_per_pixel
+
+    def frame_time_s(self, exposure_time_ms: float) -> float:
+        return (exposure_time_ms + self.readout_time_ms) * 1e-3
+
+class SimpleOverheadModel(BaseModel):
+    """
+    fixed overhead per site and per image
+
+    the defaults are placeholders, and should be replaced with values measured on the microscope.
+    """
+
+    autofocus_s: float = 0.5
+    " time for autofocus at each site, if enabled "
+    per_site_s: float = 0.0
+    per_image_s: float = 0.02
+    " e.g. z move and illumination switching "
+
+    def site_overhead_s(self, config: AcquisitionConfig) -> float:
+        return self.per_site_s + (self.autofocus_s if config.autofocus_enabled else 0.0)
+
+    def image_overhead_s(self, config: AcquisitionConfig) -> float:
+        return self.per_image_s
+
+def delta_t_seconds(delta_t: AcquisitionWellSiteConfigurationDeltaTime) -> float:
+    return delta_t.h * 3600 + delta_t.m * 60 + delta_t.s
+
+class AcquisitionEstimate(BaseModel):
+    """
+    predicted cost of an acquisition
+
+    Fields:
+        num_wells:int - number of selected wells
+        num_sites:int - number of selected sites per well
+        num_timepoints:int - number of timepoints
+        images_per_site:int - number of images per site (all z planes of all enabled channels)
+        images_per_timepoint:int - number of images per timepoint
+        total_images:int - number of images in the whole acquisition
+        bytes_per_timepoint:int - data written per timepoint [bytes]
+        total_bytes:int - data written in the whole acquisition [bytes]
+        stage_travel_mm:float - xy stage travel per timepoint [mm]
+        stage_time_s:float - time spent moving the stage per timepoint [s]
+        imaging_time_s:float - time spent at sites (imaging and overheads) per timepoint [s]
+        timepoint_duration_s:float - total time per timepoint [s]
+        delta_t_s:float - configured time between timepoints [s]
+        total_duration_s:float - time until the last timepoint is finished [s]
+        exceeds_delta_t:bool - True if there are multiple timepoints, and a timepoint takes longer than delta_t
+    """
+
+    num_wells: int
+    num_sites: int
+    num_timepoints: int
+    images_per_site: int
+    images_per_timepoint: int
+    total_images: int
+    bytes_per_timepoint: int
+    total_bytes: int
+    stage_travel_mm: float
+    stage_time_s: float
+    imaging_time_s: float
+    timepoint_duration_s: float
+    delta_t_s: float
+    total_duration_s: float
+    exceeds_delta_t: bool
+
+def estimate_acquisition(
+    config: AcquisitionConfig,
+    stage: StageModel = TrapezoidalStageModel(),
+    camera: CameraModel = SimpleCameraModel(),
+    overhead: OverheadModel = SimpleOverheadModel(),
+    plan: tp.Optional[AcquisitionPlan] = None,
+) -> AcquisitionEstimate:
+    """
+    estimate image count, data volume and duration of an acquisition
+
+    plan is the order in which positions are visited (e.g. from seaconfig.pathing.optimize_plan), and defaults to
+    AcquisitionPlan.from_config(config).
+
+    all sites are visited in the same order in every well, so stage moves within a well are only computed once.
+    the cost is therefore proportional to the number of wells plus the number of sites, not their product.
+    """
+
+    if plan is None:
+        plan = AcquisitionPlan.from_config(config)
+
+    num_wells = plan.num_wells
+    num_sites = plan.num_sites
+    num_timepoints = config.grid.num_t
+
+    # imaging at a single site
+    enabled_channels = [channel for channel in config.channels if channel.enabled]
+    images_per_site = sum(channel.num_z_planes for channel in enabled_channels)
+    image_overhead_s = overhead.image_overhead_s(config)
+    site_imaging_s = overhead.site_overhead_s(config) + sum(
+        channel.num_z_planes * (camera.frame_time_s(channel.exposure_time_ms) + image_overhead_s)
+        for channel in enabled_channels
+    )
+
+    # stage moves between sites in a well, identical for all wells
+    site_x, site_y = plan.site_offset_x_mm, plan.site_offset_y_mm
+    site_distances = [math.hypot(x1 - x0, y1 - y0) for x0, y0, x1, y1 in zip(site_x, site_y, site_x[1:], site_y[1:])]
+    stage_travel_mm = num_wells * sum(site_distances)
+    stage_time_s = num_wells * sum(stage.move_time_s(distance) for distance in site_distances)
+
+    # stage moves from the last site of one well to the first site of the next well
+    if num_wells > 1 and num_sites > 0:
+        offset_x = site_x[0] - site_x[-1]
+        offset_y = site_y[0] - site_y[-1]
+        well_x, well_y = plan.well_center_x_mm, plan.well_center_y_mm
+        for x0, y0, x1, y1 in zip(well_x, well_y, well_x[1:], well_y[1:]):
+            distance = math.hypot(x1 - x0 + offset_x, y1 - y0 + offset_y)
+            stage_travel_mm += distance
+            stage_time_s += stage.move_time_s(distance)
+
+    images_per_timepoint = num_wells * num_sites * images_per_site
+    bytes_per_timepoint = images_per_timepoint * camera.frame_bytes()
+    imaging_time_s = num_wells * num_sites * site_imaging_s
+    timepoint_duration_s = stage_time_s + imaging_time_s
+
+    delta_t_s = delta_t_seconds(config.grid.delta_t)
+    if num_timepoints > 0:
+        total_duration_s = (num_timepoints - 1) * max(delta_t_s, timepoint_duration_s) + timepoint_duration_s
+    else:
+        total_duration_s = 0.0
+
+    return AcquisitionEstimate(
+        num_wells=num_wells,
+        num_sites=num_sites,
+        num_timepoints=num_timepoints,
+        images_per_site=images_per_site,
+        images_per_timepoint=images_per_timepoint,
+        total_images=images_per_timepoint * num_timepoints,
+        bytes_per_timepoint=bytes_per_timepoint,
+        total_bytes=bytes_per_timepoint * num_timepoints,
+        stage_travel_mm=stage_travel_mm,
+        stage_time_s=stage_time_s,
+        imaging_time_s=imaging_time_s,
+        timepoint_duration_s=timepoint_duration_s,
+        delta_t_s=delta_t_s,
+        total_duration_s=total_duration_s,
+        exceeds_delta_t=num_timepoints > 1 and timepoint_duration_s > delta_t_s,
+    )
@@ -0,0 +1,256 @@
+"""
+immutable, hashable mirror types of the protocol models, for code that only reads protocols
+
+instances use __slots__ (no per-instance __dict__, no pydantic bookkeeping), so they are much smaller than the
+pydantic models and faster to read from. they are hashable (e.g. usable as cache keys) and safe to share between
+threads. lists become tuples.
+
+convert with FrozenAcquisitionConfig.from_model(config) (and likewise for the other types). small immutable values
+that repeat across protocols (wellplates, well and site selection items, config item options) are interned during
+conversion, i.e. equal values share one instance.
+"""
+
+import typing as tp
+import functools
+from dataclasses import dataclass, field
+
+from .acquisition import (
+    AcquisitionChannelConfig,
+    AcquisitionConfig,
+    AcquisitionWellSiteConfiguration,
+    PlateWellConfig,
+)
+from .config_item import ConfigItem, ConfigItemOption
+from .wellnames import well_name
+from .wellplates import Wellplate
+
+@dataclass(frozen=True, slots=True)
+class FrozenWellplate:
+    " immutable mirror of Wellplate (see there for field descriptions) "
+
+    Manufacturer: str
+    Model_name: str
+    Model_id_manufacturer: str
+    Model_id: str
+    Offset_A1_x_mm: float
+    Offset_A1_y_mm: float
+    Offset_bottom_mm: float
+    Well_distance_x_mm: float
+    Well_distance_y_mm: float
+    Well_size_x_mm: float
+    Well_size_y_mm: float
+    Num_wells_x: int
+    Num_wells_y: int
+    Length_mm: float
+    Width_mm: float
+    Well_edge_radius_mm: float
+
+    @property
+    def Num_total_wells(self) -> int:
+        return self.Num_wells_y * self.Num_wells_x
+
+    @classmethod
+    def from_model(cls, plate: Wellplate) -> "FrozenWellplate":
+        return _intern_wellplate(*(getattr(plate, name) for name in _WELLPLATE_FIELDS))
+
+    def to_model(self) -> Wellplate:
+        return Wellplate(**{name: getattr(self, name) for name in _WELLPLATE_FIELDS})
+
+_WELLPLATE_FIELDS: tp.Tuple[str, ...] = tuple(FrozenWellplate.__dataclass_fields__)
+
+@functools.lru_cache(maxsize=256)
+def _intern_wellplate(*values: tp.Any) -> FrozenWellplate:
+    return FrozenWellplate(*values)
+
+@dataclass(frozen=True, slots=True)
+class FrozenPlateWellConfig:
+    " immutable mirror of PlateWellConfig "
+
+    row: int
+    col: int
+    selected: bool
+
+    @property
+    def well_name(self) -> str:
+        return well_name(self.row, self.col)
+
+    @classmethod
+    def from_model(cls, well: PlateWellConfig) -> "FrozenPlateWellConfig":
+        return _intern_plate_well(well.row, well.col, well.selected)
+
+    def to_model(self) -> PlateWellConfig:
+        return PlateWellConfig(row=self.row, col=self.col, selected=self.selected)
+
+@functools.lru_cache(maxsize=8192)
+def _intern_plate_well(row: int, col: int, selected: bool) -> FrozenPlateWellConfig:
+    return FrozenPlateWellConfig(row, col, selected)
+
+@dataclass(frozen=True, slots=True)
+class FrozenSiteSelectionItem:
+    " immutable mirror of AcquisitionWellSiteConfigurationSiteSelectionItem "
+
+    row: int
+    col: int
+    selected: bool
+
+@functools.lru_cache(maxsize=4096)
+def _intern_site(row: int, col: int, selected: bool) -> FrozenSiteSelectionItem:
+    return FrozenSiteSelectionItem(row, col, selected)
+
+@dataclass(frozen=True, slots=True)
+class FrozenWellSiteConfiguration:
+    """
+    immutable mirror of AcquisitionWellSiteConfiguration
+
+    delta_t is given as (h, m, s) tuple.
+    """
+
+    num_x: int
+    delta_x_mm: float
+    num_y: int
+    delta_y_mm: float
+    num_t: int
+    delta_t: tp.Tuple[float, float, float]
+    mask: tp.Tuple[FrozenSiteSelectionItem, ...]
+
+    @classmethod
+    def from_model(cls, grid: AcquisitionWellSiteConfiguration) -> "FrozenWellSiteConfiguration":
+        return cls(
+            grid.num_x,
+            grid.delta_x_mm,
+            grid.num_y,
+            grid.delta_y_mm,
+            grid.num_t,
+            (grid.delta_t.h, grid.delta_t.m, grid.delta_t.s),
+            tuple(_intern_site(site.row, site.col, site.selected) for site in grid.mask),
+        )
+
+@dataclass(frozen=True, slots=True)
+class FrozenChannelConfig:
+    " immutable mirror of AcquisitionChannelConfig "
+
+    name: str
+    handle: str
+    illum_perc: float
+    exposure_time_ms: float
+    analog_gain: float
+    z_offset_um: float
+    num_z_planes: int
+    delta_z_um: float
+    filter_handle: tp.Optional[str] = None
+    enabled: bool = True
+
+    @classmethod
+    def from_model(cls, channel: AcquisitionChannelConfig) -> "FrozenChannelConfig":
+        return cls(*(getattr(channel, name) for name in _CHANNEL_FIELDS))
+
+    def to_model(self) -> AcquisitionChannelConfig:
+        return AcquisitionChannelConfig(**{name: getattr(self, name) for name in _CHANNEL_FIELDS})
+
+_CHANNEL_FIELDS: tp.Tuple[str, ...] = tuple(FrozenChannelConfig.__dataclass_fields__)
+
+@dataclass(frozen=True, slots=True)
+class FrozenConfigItemOption:
+    " immutable mirror of ConfigItemOption. info is not used for comparison and hashing (it may be any value). "
+
+    name: str
+    handle: str
+    info: tp.Any = field(default=None, compare=False)
+
+@functools.lru_cache(maxsize=1024)
+def _intern_option(name: str, handle: str) -> FrozenConfigItemOption:
+    return FrozenConfigItemOption(name, handle)
+
+def _freeze_option(option: ConfigItemOption) -> FrozenConfigItemOption:
+    if option.info is None:
+        return _intern_option(option.name, option.handle)
+    return FrozenConfigItemOption(option.name, option.handle, option.info)
+
+@dataclass(frozen=True, slots=True)
+class FrozenConfigItem:
+    """
+    immutable mirror of ConfigItem
+
+    the typed values (intvalue etc.) check the value on every read, like ConfigItem does on first read.
+    """
+
+    name: str
+    handle: str
+    value_kind: str
+    value: tp.Union[int, float, str]
+    frozen: bool = False
+    options: tp.Optional[tp.Tuple[FrozenConfigItemOption, ...]] = None
+
+    @classmethod
+    def from_model(cls, item: ConfigItem) -> "FrozenConfigItem":
+        # ConfigItem already converts int values of float items to float
+        return cls(
+            item.name,
+            item.handle,
+            item.value_kind,
+            item.value,
+            item.frozen,
+            None if item.options is None else tuple(_freeze_option(option) for option in item.options),
+        )
+
+    @property
+    def strvalue(self) -> str:
+        assert isinstance(self.value, str), f"{self.value = } ; on ${self.handle} {type(self.value) = }!=str"
+        return self.value
+
+    @property
+    def intvalue(self) -> int:
+        assert self.value_kind == "int" and isinstance(self.value, int), (
+            f"{self.value = } ; on ${self.handle} {self.value_kind}!='int' or {type(self.value) = }!=int"
+        )
+        return self.value
+
+    @property
+    def floatvalue(self) -> float:
+        assert self.value_kind == "float" and isinstance(self.value, float), (
+            f"{self.value = } ; on ${self.handle} {self.value_kind}!='float' or {type(self.value) = }!=float"
+        )
+        return self.value
+
+    @property
+    def boolvalue(self) -> bool:
+        assert isinstance(self.value, str), f"{self.value = } ; on ${self.handle} {type(self.value) = }!=bool"
+        return self.value == "yes"
+
+@dataclass(frozen=True, slots=True)
+class FrozenAcquisitionConfig:
+    """
+    immutable mirror of AcquisitionConfig
+
+    spec_version is given as (major, minor, patch) tuple.
+    """
+
+    project_name: str
+    plate_name: str
+    cell_line: str
+    grid: FrozenWellSiteConfiguration
+    wellplate_type: FrozenWellplate
+    plate_wells: tp.Tuple[FrozenPlateWellConfig, ...]
+    channels: tp.Tuple[FrozenChannelConfig, ...]
+    autofocus_enabled: bool
+    machine_config: tp.Optional[tp.Tuple[FrozenConfigItem, ...]]
+    comment: tp.Optional[str]
+    spec_version: tp.Tuple[int, int, int]
+    timestamp: tp.Optional[str]
+
+    @classmethod
+    def from_model(cls, config: AcquisitionConfig) -> "FrozenAcquisitionConfig":
+        return cls(
+            config.project_name,
+            config.plate_name,
+            config.cell_line,
+            FrozenWellSiteConfiguration.from_model(config.grid),
+            FrozenWellplate.from_model(config.wellplate_type),
+            tuple(_intern_plate_well(well.row, well.col, well.selected) for well in config.plate_wells),
+            tuple(FrozenChannelConfig.from_model(channel) for channel in config.channels),
+            config.autofocus_enabled,
+            None if config.machine_config is None else tuple(FrozenConfigItem.from_model(item) for item in config.machine_config),
+            config.comment,
+            (config.spec_version.major, config.spec_version.minor, config.spec_version.patch),
+            config.timestamp,
+        )
@@ -0,0 +1,189 @@
+"""
+opt-in timing and size measurements of seaconfig internals
+
+instrumentation is disabled by default. while disabled, each instrumented code path only checks if a recorder is
+active (a single module attribute lookup). while enabled, all measurements go to the active Recorder:
+
+    from seaconfig import instrumentation
+
+    with instrumentation.enabled() as recorder:
+        config = AcquisitionConfig.model_validate_json(data)
+        plan = AcquisitionPlan.from_config(config)
+    print(recorder.report())
+
+measurements:
+    - validate.AcquisitionConfig [s] : AcquisitionConfig.model_validate(_json), validate.json_bytes [bytes] : size of validated json
+    - validate.<field> [s] : time to validate each sub-model of an AcquisitionConfig (grid, wellplate_type, plate_wells,
+      channels, machine_config), see Recorder.validation_breakdown
+    - load.cache_hit / load.cache_miss (counts) : ProtocolLoader
+    - plan.build [s], plan.num_wells, plan.num_sites : AcquisitionPlan construction
+    - wellplate.get_well_offset (count), wellplate.get_well_positions [s] : well offset computations
+
+measurements are recorded from all threads into the same recorder.
+"""
+
+import typing as tp
+import contextlib
+import json
+import math
+import threading
+import time
+
+Callback = tp.Callable[[str, float], tp.Any]
+
+class Histogram:
+    """
+    summary of recorded values, with power of two buckets
+
+    Fields:
+        count:int - number of values
+        total:float - sum of values
+        min:float
+        max:float
+        buckets:tp.Dict[int,int] - number of values v with 2**(e-1) <= v < 2**e, by e (values <= 0 are counted in bucket None)
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.buckets: tp.Dict[tp.Optional[int], int] = {}
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        bucket = math.frexp(value)[1] if value > 0 else None
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count > 0 else math.nan
+
+    def to_dict(self) -> tp.Dict[str, tp.Any]:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.mean,
+            "buckets": {("<=0" if bucket is None else f"<2^{bucket}"): count for bucket, count in sorted(self.buckets.items(), key=lambda item: -math.inf if item[0] is None else item[0])},
+        }
+
+class Recorder:
+    """
+    collects counters and histograms
+
+    callbacks are called with (name, value) for every recorded count and value, e.g. to forward measurements to a
+    monitoring system. they are called while a lock is held, and must not record into the same recorder.
+    """
+
+    def __init__(self, callbacks: tp.Iterable[Callback] = (), validation_breakdown: bool = True):
+        """
+        if validation_breakdown is True, each validated AcquisitionConfig is validated again field by field, to record
+        the time per field (validate.<field>). this roughly doubles the time to validate a config.
+        """
+
+        self.validation_breakdown = validation_breakdown
+        self.counters: tp.Dict[str, int] = {}
+        self.histograms: tp.Dict[str, Histogram] = {}
+        self.callbacks: tp.List[Callback] = list(callbacks)
+        self._lock = threading.Lock()
+
+    def count(self, name: str, increment: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + increment
+            for callback in self.callbacks:
+                callback(name, increment)
+
+    def record(self, name: str, value: float):
+        " add value to the histogram name "
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.add(value)
+            for callback in self.callbacks:
+                callback(name, value)
+
+    @contextlib.contextmanager
+    def timer(self, name: str) -> tp.Iterator[None]:
+        " record the duration [s] of the with block in the histogram name "
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start_time)
+
+    def clear(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def to_dict(self) -> tp.Dict[str, tp.Any]:
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "histograms": {name: histogram.to_dict() for name, histogram in self.histograms.items()},
+            }
+
+    def to_json(self, indent: tp.Optional[int] = 2) -> str:
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def report(self) -> str:
+        " plain text table of all counters and histograms "
+        with self._lock:
+            lines = []
+            if self.counters:
+                lines.append(f"{'counter':<32} {'count':>10}")
+                lines.extend(f"{name:<32} {count:>10}" for name, count in sorted(self.counters.items()))
+            if self.histograms:
+                if lines:
+                    lines.append("")
+                lines.append(f"{'histogram':<32} {'count':>10} {'mean':>12} {'min':>12} {'max':>12} {'total':>12}")
+                for name, histogram in sorted(self.histograms.items()):
+                    lines.append(
+                        f"{name:<32} {histogram.count:>10} {histogram.mean:12.4g} {histogram.min:12.4g} "
+                        f"{histogram.max:12.4g} {histogram.total:12.4g}"
+                    )
+            return "\n".join(lines) if lines else "no measurements"
+
+recorder: tp.Optional[Recorder] = None
+" active recorder, None while instrumentation is disabled "
+
+def enable(new_recorder: tp.Optional[Recorder] = None) -> Recorder:
+    " start recording into new_recorder (or a new Recorder), which is returned "
+    global recorder
+    recorder = new_recorder if new_recorder is not None else Recorder()
+    return recorder
+
+def disable():
+    global recorder
+    recorder = None
+
+@contextlib.contextmanager
+def enabled(
+    new_recorder: tp.Optional[Recorder] = None,
+    callback: tp.Optional[Callback] = None,
+) -> tp.Iterator[Recorder]:
+    """
+    record measurements within the with block. the previously active recorder (if any) is restored afterwards.
+
+    callback is added to the callbacks of the recorder (see Recorder) for the duration of the with block.
+    """
+
+    global recorder
+    previous = recorder
+    active = enable(new_recorder)
+    if callback is not None:
+        with active._lock:
+            active.callbacks.append(callback)
+    try:
+        yield active
+    finally:
+        recorder = previous
+        if callback is not None:
+            with active._lock:
+                active.callbacks.remove(callback)
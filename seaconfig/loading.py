@@ -0,0 +1,108 @@
+import typing as tp
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from . import instrumentation
+from .acquisition import AcquisitionConfig
+
+def content_hash(data: bytes) -> str:
+    " hash used to identify protocol file contents "
+    return hashlib.sha256(data).hexdigest()
+
+class ProtocolLoader:
+    """
+    loads AcquisitionConfig protocol files, caching the validated configs by content hash
+
+    a file is only parsed and validated the first time its content is seen. afterwards:
+        - load of a file that has not changed on disk (same path, size and modification time) returns the cached
+          config without reading the file. set trust_file_stat=False to always read and hash the file instead.
+        - load/loads of content that has been seen before (under any path) returns the cached config after hashing it.
+
+    configs returned by this loader are shared between all callers that load the same content, and must not be modified.
+    use config.model_copy(deep=True) to get a config that can be modified.
+
+    note: pydantic validates json in compiled code, which is faster than skipping validation and constructing the
+    models in python (e.g. with model_construct), so content that is not in the cache is always fully validated.
+    """
+
+    def __init__(self, max_size: int = 128, trust_file_stat: bool = True):
+        """
+        max_size is the number of configs kept in the cache. the least recently used config is evicted first.
+        """
+
+        self.max_size = max_size
+        self.trust_file_stat = trust_file_stat
+
+        self._lock = threading.Lock()
+        self._by_hash: "OrderedDict[str, AcquisitionConfig]" = OrderedDict()
+        self._hash_by_stat: tp.Dict[tp.Tuple[str, int, int], str] = {}
+
+    def _get(self, digest: str) -> tp.Optional[AcquisitionConfig]:
+        with self._lock:
+            config = self._by_hash.get(digest)
+            if config is not None:
+                self._by_hash.move_to_end(digest)
+            return config
+
+    def _put(self, digest: str, config: AcquisitionConfig):
+        with self._lock:
+            self._by_hash[digest] = config
+            self._by_hash.move_to_end(digest)
+            while len(self._by_hash) > self.max_size:
+                evicted, _ = self._by_hash.popitem(last=False)
+                self._hash_by_stat = {key: value for key, value in self._hash_by_stat.items() if value != evicted}
+
+    def _load_bytes(self, data: bytes, digest: str) -> AcquisitionConfig:
+        config = self._get(digest)
+        recorder = instrumentation.recorder
+        if recorder is not None:
+            recorder.count("load.cache_hit" if config is not None else "load.cache_miss")
+        if config is None:
+            config = AcquisitionConfig.model_validate_json(data)
+            self._put(digest, config)
+
+        return config
+
+    def loads(self, data: tp.Union[str, bytes]) -> AcquisitionConfig:
+        " load config from json "
+
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+
+        return self._load_bytes(data, content_hash(data))
+
+    def load(self, path: tp.Union[str, Path]) -> AcquisitionConfig:
+        " load config from json file "
+
+        stat_key = None
+        if self.trust_file_stat:
+            stat = os.stat(path)
+            stat_key = (os.fspath(path), stat.st_size, stat.st_mtime_ns)
+            digest = self._hash_by_stat.get(stat_key)
+            if digest is not None:
+                config = self._get(digest)
+                if config is not None:
+                    recorder = instrumentation.recorder
+                    if recorder is not None:
+                        recorder.count("load.cache_hit")
+                    return config
+
+        data = Path(path).read_bytes()
+        digest = content_hash(data)
+        config = self._load_bytes(data, digest)
+        if stat_key is not None:
+            with self._lock:
+                self._hash_by_stat[stat_key] = digest
+
+        return config
+
+    def clear(self):
+        with self._lock:
+            self._by_hash.clear()
+            self._hash_by_stat.clear()
+
+protocol_loader = ProtocolLoader()
+""" default protocol loader """
@@ -0,0 +1,260 @@
+"""
+migration of protocol files written against older versions of the specification
+
+migration steps operate on the raw (json decoded) dict of a protocol file, before pydantic validation, so that they
+can handle files that do not validate against the current models anymore.
+
+run as `python -m seaconfig.migration <directory>` to upgrade all protocol files in a directory tree in place.
+"""
+
+import typing as tp
+import argparse
+import importlib
+import json
+import multiprocessing
+import os
+import re
+import secrets
+import stat
+import time
+from pathlib import Path
+
+from .acquisition import LATEST_SPEC_VERSION, AcquisitionConfig, Version
+
+MigrationStep = tp.Callable[[tp.Dict[str, tp.Any]], tp.Dict[str, tp.Any]]
+
+_VersionKey = tp.Tuple[int, int, int]
+
+_MIGRATIONS: tp.Dict[_VersionKey, tp.Tuple[Version, MigrationStep]] = {}
+
+def _version_key(version: Version) -> _VersionKey:
+    return (version.major, version.minor, version.patch)
+
+def register_migration(from_version: Version, to_version: Version) -> tp.Callable[[MigrationStep], MigrationStep]:
+    """
+    decorator to register a migration step that upgrades a protocol dict with spec_version from_version to to_version
+
+    the step may modify the dict in place, and must return the upgraded dict. spec_version is updated by the pipeline.
+
+    e.g.
+        @register_migration(Version(major=5,minor=0,patch=0), Version(major=6,minor=0,patch=0))
+        def _5_to_6(protocol):
+            protocol["channels"] = protocol.pop("channel_config")
+            return protocol
+    """
+
+    if not from_version.smaller_than(to_version):
+        raise ValueError(f"migration must upgrade the version, but {to_version} is not larger than {from_version}")
+
+    def decorator(step: MigrationStep) -> MigrationStep:
+        key = _version_key(from_version)
+        if key in _MIGRATIONS:
+            raise ValueError(f"there is already a migration registered from version {from_version}")
+        _MIGRATIONS[key] = (to_version, step)
+        return step
+
+    return decorator
+
+def get_spec_version(protocol: tp.Dict[str, tp.Any]) -> Version:
+    " spec version of a protocol dict. missing spec_version is interpreted as LATEST_SPEC_VERSION, like AcquisitionConfig does "
+    if "spec_version" not in protocol:
+        return LATEST_SPEC_VERSION
+    return Version.model_validate(protocol["spec_version"])
+
+def needs_migration(version: Version) -> bool:
+    return version.smaller_than(LATEST_SPEC_VERSION)
+
+def migrate(protocol: tp.Dict[str, tp.Any]) -> tp.Dict[str, tp.Any]:
+    """
+    upgrade a protocol dict to LATEST_SPEC_VERSION, by applying all registered migration steps in order
+
+    raises ValueError if there is no migration path from the version of the protocol
+    """
+
+    version = get_spec_version(protocol)
+    while needs_migration(version):
+        migration = _MIGRATIONS.get(_version_key(version))
+        if migration is None:
+            raise ValueError(f"no migration registered from spec version {version} (latest is {LATEST_SPEC_VERSION})")
+
+        version, step = migration
+        protocol = step(protocol)
+        protocol["spec_version"] = version.model_dump()
+
+    return protocol
+
+# matches the spec_version object in a protocol file, which does not contain nested objects
+_SPEC_VERSION_RE = re.compile(rb'"spec_version"\s*:\s*(\{[^{}]*\})')
+
+def peek_spec_version(data: bytes) -> Version:
+    """
+    get spec version of a protocol file without parsing the whole file
+
+    falls back to parsing the whole file if the spec_version field cannot be found directly
+    (e.g. because the file contains the text "spec_version" somewhere else).
+    """
+
+    matches = _SPEC_VERSION_RE.findall(data)
+    if len(matches) == 1:
+        return Version.model_validate_json(matches[0])
+
+    if len(matches) == 0 and b'"spec_version"' not in data:
+        return LATEST_SPEC_VERSION
+
+    return get_spec_version(json.loads(data))
+
+# umask of the process, to give new files the same permissions as open() would
+def _create_temp_file(path: Path) -> tp.Tuple[int, Path]:
+    " create a new, empty temporary file next to path. like for any new file, its permissions are 0o666 minus the umask "
+    for _ in range(100):
+        tmp_path = path.parent / f".{path.name}.{secrets.token_hex(4)}.tmp"
+        try:
+            return os.open(tmp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666), tmp_path
+        except FileExistsError:
+            continue
+    raise FileExistsError(f"could not create a temporary file for {path}")
+
+def write_atomic(path: Path, data: bytes):
+    """
+    write data to path, such that path contains either the old or the new content at any time
+
+    an existing file keeps its permissions, a new file gets the default permissions (according to the umask)
+    """
+
+    fd, tmp_path = _create_temp_file(path)
+    try:
+        with os.fdopen(fd, "wb") as file:
+            try:
+                os.chmod(file.fileno(), stat.S_IMODE(os.stat(path).st_mode))
+            except FileNotFoundError:
+                pass
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+class MigrationResult(tp.NamedTuple):
+    """
+    Fields:
+        path:str - protocol file
+        status:str - one of "skipped" (already up to date), "migrated", "failed"
+        error:tp.Optional[str] - error message, if status is "failed"
+    """
+
+    path: str
+    status: tp.Literal["skipped", "migrated", "failed"]
+    error: tp.Optional[str] = None
+
+def migrate_file(path: tp.Union[str, Path], validate: bool = True, dry_run: bool = False) -> MigrationResult:
+    """
+    upgrade a protocol file in place
+
+    if validate is True, the upgraded protocol is validated as AcquisitionConfig before it is written.
+    if dry_run is True, the file is not written.
+    """
+
+    path = Path(path)
+    try:
+        data = path.read_bytes()
+        if not needs_migration(peek_spec_version(data)):
+            return MigrationResult(str(path), "skipped")
+
+        protocol = migrate(json.loads(data))
+        if validate:
+            AcquisitionConfig.model_validate(protocol)
+        if not dry_run:
+            write_atomic(path, json.dumps(protocol, indent=2).encode("utf-8"))
+    except Exception as e:
+        return MigrationResult(str(path), "failed", f"{type(e).__name__}: {e}")
+
+    return MigrationResult(str(path), "migrated")
+
+def load_plugins(plugins: tp.Iterable[str]):
+    """
+    import the modules named in plugins (e.g. "mylab.seaconfig_migrations"), which register migration steps with
+    register_migration when they are imported
+    """
+
+    for plugin in plugins:
+        importlib.import_module(plugin)
+
+def _migrate_file_task(args: tp.Tuple[Path, bool, bool]) -> MigrationResult:
+    return migrate_file(*args)
+
+def migrate_tree(
+    root: tp.Union[str, Path],
+    pattern: str = "*.json",
+    num_workers: tp.Optional[int] = None,
+    chunksize: int = 16,
+    validate: bool = True,
+    dry_run: bool = False,
+    plugins: tp.Sequence[str] = (),
+) -> tp.Iterator[MigrationResult]:
+    """
+    upgrade all protocol files matching pattern in the directory tree at root, using a pool of num_workers processes
+    (defaults to the number of cpus)
+
+    files are streamed to the workers while the tree is walked, and results are yielded as they complete (in any order).
+
+    plugins are modules that register migration steps (see load_plugins). they are imported in every worker process,
+    since steps registered only in the calling process are not known to workers that are not forked from it (e.g. with
+    the spawn or forkserver start methods).
+    """
+
+    load_plugins(plugins)
+    tasks = ((path, validate, dry_run) for path in Path(root).rglob(pattern) if path.is_file())
+    with multiprocessing.Pool(num_workers, initializer=load_plugins, initargs=(tuple(plugins),)) as pool:
+        yield from pool.imap_unordered(_migrate_file_task, tasks, chunksize=chunksize)
+
+def main(argv: tp.Optional[tp.List[str]] = None):
+    parser = argparse.ArgumentParser(
+        prog="python -m seaconfig.migration",
+        description=f"upgrade protocol files in a directory tree to spec version {LATEST_SPEC_VERSION.major}.{LATEST_SPEC_VERSION.minor}.{LATEST_SPEC_VERSION.patch} (in place)",
+    )
+    parser.add_argument("root", type=Path, help="directory containing protocol files")
+    parser.add_argument("--pattern", default="*.json", help="glob pattern of protocol files (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes (default: number of cpus)")
+    parser.add_argument("--chunksize", type=int, default=16, help="number of files sent to a worker at once (default: %(default)s)")
+    parser.add_argument("--no-validate", action="store_true", help="do not validate upgraded protocols before writing them")
+    parser.add_argument("--dry-run", action="store_true", help="do not write upgraded protocols")
+    parser.add_argument(
+        "--plugin",
+        action="append",
+        default=[],
+        help="module that registers migration steps, imported before migrating (may be given multiple times)",
+    )
+    args = parser.parse_args(argv)
+
+    counts = {"skipped": 0, "migrated": 0, "failed": 0}
+    start_time = time.perf_counter()
+    for result in migrate_tree(
+        args.root,
+        pattern=args.pattern,
+        num_workers=args.workers,
+        chunksize=args.chunksize,
+        validate=not args.no_validate,
+        dry_run=args.dry_run,
+        plugins=args.plugin,
+    ):
+        counts[result.status] += 1
+        if result.status == "failed":
+            print(f"failed: {result.path}: {result.error}")
+    duration_s = time.perf_counter() - start_time
+
+    num_files = sum(counts.values())
+    print(
+        f"{num_files} files in {duration_s:.2f}s ({num_files / max(duration_s, 1e-9):.0f} files/s): "
+        f"{counts['migrated']} migrated, {counts['skipped']} skipped, {counts['failed']} failed"
+    )
+
+    if counts["failed"] > 0:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    # run main from the imported module (not from __main__), so that worker processes and registered migrations
+    # refer to the same module
+    from seaconfig.migration import main as _main
+    _main()
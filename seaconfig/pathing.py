@@ -0,0 +1,170 @@
+import typing as tp
+import math
+
+from .plan import AcquisitionPlan
+
+PathStrategy=tp.Literal["row_serpentine","col_serpentine","nearest_neighbour"]
+"""
+strategy used to order positions:
+    - row_serpentine : go along each row, alternating direction between rows
+    - col_serpentine : go along each column, alternating direction between columns
+    - nearest_neighbour : greedily go to the closest unvisited position, then improve the path with 2-opt
+"""
+
+PATH_STRATEGIES:tp.Tuple[PathStrategy,...]=tp.get_args(PathStrategy)
+
+def _serpentine(points:tp.Sequence[tp.Tuple[int,int]],by_row:bool)->tp.List[tp.Tuple[int,int]]:
+    " order (row,col) points in serpentine order, alternating direction between occupied lines "
+
+    lines:tp.Dict[int,tp.List[int]]={}
+    for row,col in points:
+        if by_row:
+            lines.setdefault(row,[]).append(col)
+        else:
+            lines.setdefault(col,[]).append(row)
+
+    ret=[]
+    for i,line in enumerate(sorted(lines)):
+        others=sorted(lines[line],reverse=i%2==1)
+        if by_row:
+            ret.extend((line,other) for other in others)
+        else:
+            ret.extend((other,line) for other in others)
+
+    return ret
+
+def _path_length(xs:tp.Sequence[float],ys:tp.Sequence[float])->float:
+    return sum(math.hypot(x1-x0,y1-y0) for x0,y0,x1,y1 in zip(xs,ys,xs[1:],ys[1:]))
+
+def _nearest_neighbour(xs:tp.Sequence[float],ys:tp.Sequence[float])->tp.List[int]:
+    " greedy path through all points, starting at the first one. returns point indices in visiting order "
+
+    if len(xs)==0:
+        return []
+
+    unvisited=set(range(1,len(xs)))
+    order=[0]
+    x,y=xs[0],ys[0]
+    while unvisited:
+        # ties are broken by index, which keeps the result deterministic on regular grids
+        nearest=min(unvisited,key=lambda i:((xs[i]-x)**2+(ys[i]-y)**2,i))
+        unvisited.remove(nearest)
+        order.append(nearest)
+        x,y=xs[nearest],ys[nearest]
+
+    return order
+
+def _two_opt(order:tp.List[int],xs:tp.Sequence[float],ys:tp.Sequence[float],max_passes:int)->tp.List[int]:
+    """
+    improve an open path by reversing segments where this shortens the path
+
+    stops after max_passes passes over all segment pairs, or when a pass brings no improvement
+    """
+
+    def dist(a:int,b:int)->float:
+        return math.hypot(xs[a]-xs[b],ys[a]-ys[b])
+
+    n=len(order)
+    for _ in range(max_passes):
+        improved=False
+        for i in range(n-2):
+            a,b=order[i],order[i+1]
+            d_ab=dist(a,b)
+            for j in range(i+2,n):
+                c=order[j]
+                if j+1<n:
+                    d=order[j+1]
+                    gain=d_ab+dist(c,d)-dist(a,c)-dist(b,d)
+                else:
+                    # path end: reversing the tail only replaces edge a-b with a-c
+                    gain=d_ab-dist(a,c)
+
+                if gain>1e-9:
+                    order[i+1:j+1]=order[i+1:j+1][::-1]
+                    b=order[i+1]
+                    d_ab=dist(a,b)
+                    improved=True
+
+        if not improved:
+            break
+
+    return order
+
+def order_positions(
+    points:tp.Sequence[tp.Tuple[int,int]],
+    xs:tp.Sequence[float],
+    ys:tp.Sequence[float],
+    strategy:PathStrategy="row_serpentine",
+    max_two_opt_passes:int=5,
+)->tp.List[tp.Tuple[int,int]]:
+    """
+    order (row,col) points, with physical positions xs[i],ys[i] [mm], to reduce travel between them
+
+    max_two_opt_passes is only used by the nearest_neighbour strategy. 2-opt is O(n^2) per pass.
+    """
+
+    if strategy=="row_serpentine":
+        return _serpentine(points,by_row=True)
+    if strategy=="col_serpentine":
+        return _serpentine(points,by_row=False)
+    if strategy=="nearest_neighbour":
+        if len(points)==0:
+            return []
+
+        # start in the top left corner, like the serpentine strategies
+        start=min(range(len(points)),key=lambda i:points[i])
+        indices=[start]+[i for i in range(len(points)) if i!=start]
+        xs=[xs[i] for i in indices]
+        ys=[ys[i] for i in indices]
+        order=_two_opt(_nearest_neighbour(xs,ys),xs,ys,max_passes=max_two_opt_passes)
+        return [points[indices[i]] for i in order]
+
+    raise ValueError(f"unknown path strategy {strategy!r}, must be one of {PATH_STRATEGIES}")
+
+def optimize_plan(plan:AcquisitionPlan,strategy:PathStrategy="row_serpentine",max_two_opt_passes:int=5)->AcquisitionPlan:
+    """
+    return a new plan with wells and sites reordered according to strategy
+
+    wells are ordered by well center position on the plate, sites by their position within the site grid.
+    the same site order is used for every well.
+    """
+
+    wells=order_positions(
+        plan.wells,
+        plan.well_center_x_mm,
+        plan.well_center_y_mm,
+        strategy=strategy,
+        max_two_opt_passes=max_two_opt_passes,
+    )
+    sites=order_positions(
+        plan.sites,
+        plan.site_offset_x_mm,
+        plan.site_offset_y_mm,
+        strategy=strategy,
+        max_two_opt_passes=max_two_opt_passes,
+    )
+    return AcquisitionPlan(plan.wellplate,plan.grid,wells,sites)
+
+def travel_distance_mm(plan:AcquisitionPlan)->float:
+    """
+    estimated total xy stage travel to visit all positions of the plan in order [mm]
+
+    this is the sum of straight line distances between consecutive positions.
+    """
+
+    return _path_length(plan.x_mm,plan.y_mm)
+
+def compare_path_strategies(
+    plan:AcquisitionPlan,
+    strategies:tp.Iterable[PathStrategy]=PATH_STRATEGIES,
+    max_two_opt_passes:int=5,
+)->tp.Dict[str,float]:
+    """
+    get the estimated travel distance [mm] of plan, in its current order (key "unchanged"), and after optimization with each strategy
+    """
+
+    ret={"unchanged":travel_distance_mm(plan)}
+    for strategy in strategies:
+        ret[strategy]=travel_distance_mm(optimize_plan(plan,strategy,max_two_opt_passes=max_two_opt_passes))
+
+    return ret
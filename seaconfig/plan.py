@@ -0,0 +1,131 @@
+import typing as tp
+import functools
+import time
+from array import array
+
+from . import instrumentation
+from .acquisition import AcquisitionConfig, AcquisitionWellSiteConfiguration
+from .wellplates import Wellplate
+
+class PlannedSite(tp.NamedTuple):
+    """
+    one position to visit during an acquisition
+
+    Fields:
+        well_row:int - row index of the well on the plate, starting at 0
+        well_col:int - column index of the well on the plate, starting at 0
+        site_row:int - row index of the site in the well site grid, starting at 0
+        site_col:int - column index of the site in the well site grid, starting at 0
+        x_mm:float - stage position in x [mm]
+        y_mm:float - stage position in y [mm]
+    """
+
+    well_row:int
+    well_col:int
+    site_row:int
+    site_col:int
+    x_mm:float
+    y_mm:float
+
+class AcquisitionPlan:
+    """
+    all stage positions to visit for an acquisition, i.e. every selected site in every selected well
+
+    the site grid is centered on the well center, with sites delta_x_mm (delta_y_mm) apart.
+    positions are ordered by well, then by site, in the order of wells and sites given on construction.
+
+    the plan can be consumed either lazily, by iterating over it (yields one PlannedSite per position, no list of all
+    positions is built), or as dense arrays (well_row, well_col, site_row, site_col, x_mm, y_mm), which are computed on first access.
+    """
+
+    def __init__(
+        self,
+        wellplate:Wellplate,
+        grid:AcquisitionWellSiteConfiguration,
+        wells:tp.Sequence[tp.Tuple[int,int]],
+        sites:tp.Sequence[tp.Tuple[int,int]],
+    ):
+        """
+        wells and sites are (row,col) index tuples, in the order they should be visited.
+
+        raises ValueError if any well is invalid on the plate, or any site is outside of the site grid
+        """
+
+        recorder=instrumentation.recorder
+        start_time=time.perf_counter() if recorder is not None else 0.0
+
+        self.wellplate=wellplate
+        self.grid=grid
+        self.wells=tuple(wells)
+        self.sites=tuple(sites)
+
+        for row,col in self.sites:
+            if not (0<=row<grid.num_y and 0<=col<grid.num_x):
+                raise ValueError(f"site ({row},{col}) is outside of the site grid with {grid.num_y} rows and {grid.num_x} columns")
+
+        well_positions=wellplate.get_well_positions(self.wells)
+        self.well_center_x_mm=well_positions.center_x_mm
+        self.well_center_y_mm=well_positions.center_y_mm
+
+        # offset of each site from the well center
+        grid_origin_x_mm=-(grid.num_x-1)*grid.delta_x_mm/2
+        grid_origin_y_mm=-(grid.num_y-1)*grid.delta_y_mm/2
+        self.site_offset_x_mm=array("d",[grid_origin_x_mm+col*grid.delta_x_mm for _,col in self.sites])
+        self.site_offset_y_mm=array("d",[grid_origin_y_mm+row*grid.delta_y_mm for row,_ in self.sites])
+
+        if recorder is not None:
+            recorder.record("plan.build",time.perf_counter()-start_time)
+            recorder.record("plan.num_wells",len(self.wells))
+            recorder.record("plan.num_sites",len(self.sites))
+
+    @classmethod
+    def from_config(cls,config:AcquisitionConfig)->"AcquisitionPlan":
+        """
+        compile the plan for all selected sites in all selected wells of config, in the order they are listed in the config
+        """
+
+        wells=[(well.row,well.col) for well in config.plate_wells if well.selected]
+        sites=[(site.row,site.col) for site in config.grid.mask if site.selected]
+        return cls(config.wellplate_type,config.grid,wells,sites)
+
+    @property
+    def num_wells(self)->int:
+        return len(self.wells)
+
+    @property
+    def num_sites(self)->int:
+        " number of sites per well "
+        return len(self.sites)
+
+    def __len__(self)->int:
+        return len(self.wells)*len(self.sites)
+
+    def __iter__(self)->tp.Iterator[PlannedSite]:
+        sites=tuple(zip(self.sites,self.site_offset_x_mm,self.site_offset_y_mm))
+        for (well_row,well_col),center_x_mm,center_y_mm in zip(self.wells,self.well_center_x_mm,self.well_center_y_mm):
+            for (site_row,site_col),offset_x_mm,offset_y_mm in sites:
+                yield PlannedSite(well_row,well_col,site_row,site_col,center_x_mm+offset_x_mm,center_y_mm+offset_y_mm)
+
+    @functools.cached_property
+    def well_row(self)->array:
+        return array("H",[row for row,_ in self.wells for _ in self.sites])
+
+    @functools.cached_property
+    def well_col(self)->array:
+        return array("H",[col for _,col in self.wells for _ in self.sites])
+
+    @functools.cached_property
+    def site_row(self)->array:
+        return array("H",[row for row,_ in self.sites]*len(self.wells))
+
+    @functools.cached_property
+    def site_col(self)->array:
+        return array("H",[col for _,col in self.sites]*len(self.wells))
+
+    @functools.cached_property
+    def x_mm(self)->array:
+        return array("d",[center+offset for center in self.well_center_x_mm for offset in self.site_offset_x_mm])
+
+    @functools.cached_property
+    def y_mm(self)->array:
+        return array("d",[center+offset for center in self.well_center_y_mm for offset in self.site_offset_y_mm])
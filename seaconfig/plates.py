@@ -1,10 +1,12 @@
-from .wellplates import Wellplate
+import typing as tp
 
-Plates = [
+from .wellplates import Wellplate, WellplateReference
+
+_PLATE_DATA: tp.List[tp.Dict[str, tp.Any]] = [
 
     # --- revvity plates
 
-    Wellplate(
+    dict(
         # https://www.revvity.com/se-en/product/phenoplate-96-tc-lid-case-2x20b-6055302#overview
         # https://resources.revvity.com/pdfs/prd-phenoplate-96-well-microplates-hca.pdf
         Manufacturer="Revvity",
@@ -24,7 +26,7 @@ Plates = [
         Well_distance_y_mm=9,
         Offset_bottom_mm=0.118 + 0.210,  # foil + bottom height
     ),
-    Wellplate(
+    dict(
         # https://www.revvity.com/se-en/product/ula-phenoplate-384-lid-case-10x1b-6057800#overview
         # https://resources.revvity.com/pdfs/prd-phenoplate-384-well%20microplates-hca.pdf
         Manufacturer="Revvity",
@@ -44,7 +46,7 @@ Plates = [
         Well_distance_y_mm=4.5,
         Offset_bottom_mm=0.118 + 0.210,  # foil + bottom height
     ),
-    Wellplate(
+    dict(
         # https://www.revvity.com/se-en/product/phenoplate-1536-tc-lid-case-2x25b-6054305
         Manufacturer="Revvity",
         Model_name="PhenoPlate 1536-well",
@@ -66,7 +68,7 @@ Plates = [
 
     # --- thermofisher plates
 
-    Wellplate(
+    dict(
         # https://www.thermofisher.com/order/catalog/product/165305
         # https://assets.thermofisher.com/TFS-Assets/LCD/Schematics-%26-Diagrams/1653xx_0713.pdf
         Manufacturer="ThermoFisher",
@@ -86,7 +88,7 @@ Plates = [
         Well_distance_y_mm=9,
         Offset_bottom_mm=2.2,
     ),
-    Wellplate(
+    dict(
         # https://www.thermofisher.com/order/catalog/product/A58941
         Manufacturer="ThermoFisher",
         Model_name="384-well (A58941)",
@@ -105,7 +107,7 @@ Plates = [
         Well_distance_y_mm=4.5,
         Offset_bottom_mm=2.2,  # from thermofisher-nunc-96
     ),
-    Wellplate(
+    dict(
         # https://www.thermofisher.com/order/catalog/product/142761
         # https://assets.thermofisher.com/TFS-Assets/LCD/Schematics-%26-Diagrams/2427xx_0207%20PS%20384%20OBP.pdf
         Manufacturer="ThermoFisher",
@@ -125,7 +127,7 @@ Plates = [
         Well_distance_y_mm=4.5,
         Offset_bottom_mm=1.7 + 0.25, # bottom thickness + distance to bottom
     ),
-    Wellplate(
+    dict(
         # https://www.thermofisher.com/order/catalog/product/253601
         # https://assets.thermofisher.com/TFS-Assets/LSG/manuals/D03007.pdf
         Manufacturer="ThermoFisher",
@@ -150,7 +152,7 @@ Plates = [
 
     # tech specs for corning 96,384,1536 plates:
     # https://www.corning.com/catalog/cls/documents/drawings/MicroplateDimensions96-384-1536.pdf
-    Wellplate(
+    dict(
         # https://ecatalog.corning.com/life-sciences/b2c/US/en/Microplates/Assay-Microplates/96-Well-Microplates/Falcon%C2%AE-96-well-Polystyrene-Microplates/p/353072
         Manufacturer="Corning",
         Model_name="Falcon 96-well",
@@ -169,7 +171,7 @@ Plates = [
         Well_distance_y_mm=8.99,
         Offset_bottom_mm=14.30 - 10.76,  # plate height - well depth
     ),
-    Wellplate(
+    dict(
         # https://ecatalog.corning.com/life-sciences/b2b/NO/en/Microplates/Assay-Microplates/384-Well-Microplates/Falcon%C2%AE-384-well-Microplates/p/353961
         Manufacturer="Corning",
         Model_name="Falcon 384 (353961)",
@@ -188,7 +190,7 @@ Plates = [
         Well_distance_y_mm=4.5,
         Offset_bottom_mm=14.30 - 10.76, # plate height - well depth (from corning-falcon-96)
     ),
-    Wellplate(
+    dict(
         # https://ecatalog.corning.com/life-sciences/b2c/US/en/Microplates/Assay-Microplates/384-Well-Microplates/Falcon%C2%AE-384-well-Microplates/p/353962
         Manufacturer="Corning",
         Model_name="Falcon 384 (353962)",
@@ -207,7 +209,7 @@ Plates = [
         Well_distance_y_mm=4.5, # unspecified
         Offset_bottom_mm=2, # unspecified
     ),
-    Wellplate(
+    dict(
         # https://ecatalog.corning.com/life-sciences/b2c/US/en/Microplates/Assay-Microplates/1536-well-Microplates/Corning%C2%AE1536-well-Standard-Polystyrene-Microplates-and-Low-Base/p/3832
         Manufacturer="Corning",
         Model_name="Corning 1536-well",
@@ -229,7 +231,7 @@ Plates = [
 
     # --- agilent plates
 
-    Wellplate(
+    dict(
         # https://www.agilent.com/store/en_US/Prod-204628-100/204628-100
         # https://www.agilent.com/cs/library/datasheets/public/ds-cell-analysis-5994-4394en-agilent.pdf
         # https://www.agilent.com/cs/library/flyers/public/fl-cell-analysis-5994-5094en-agilent.pdf
@@ -253,7 +255,7 @@ Plates = [
 
     # --- greiner plates
 
-    Wellplate(
+    dict(
         # https://shop.gbo.com/en/row/products/bioscience/cell-culture-products/cellstar-cell-culture-microplates/384-well-cell-culture-microplates-clear-black-white/781091.html
         # https://shop.gbo.com/en/row/files/25388026/781091.pdf
         Manufacturer="Greiner",
@@ -273,7 +275,7 @@ Plates = [
         Well_distance_y_mm=4.5,
         Offset_bottom_mm=14.4-11.5, # plate height - well depth
     ),
-    Wellplate(
+    dict(
         # https://shop.gbo.com/en/row/products/bioscience/microscopy/en-screenstar-microplates/781866.html?sword_list%5B0%5D=781866&no_cache=1
         # https://shop.gbo.com/en/row/files/25388061/781866.pdf
         Manufacturer="Greiner",
@@ -296,7 +298,7 @@ Plates = [
 
     # --- glass slide holder
 
-    Wellplate(
+    dict(
         Manufacturer="Generic",
         Model_name="Slide Holder",
         Model_id_manufacturer="holder1",
@@ -314,7 +316,7 @@ Plates = [
         Well_distance_y_mm=0,  # n/a
         Offset_bottom_mm=0.08 + 1.72,  # placeholder
     ),
-    Wellplate(
+    dict(
         # https://www.thorlabs.com/thorproduct.cfm?partnumber=C4SH01
         # https://www.thorlabs.com/drawings/d84f1745da0d3e5d-3DCAE562-D5A6-C2A7-7968BDAF035D52A2/C4SH01-AutoCADPDF.pdf
         Manufacturer="Thorlabs",
@@ -335,4 +337,182 @@ Plates = [
         Offset_bottom_mm=0.08 + 1.72,  # placeholder
     ),
 ]
-""" a list of known wellplates """
\ No newline at end of file
+""" field values of the known wellplates. Wellplate instances are only created on first access (see PlateRegistry) """
+class PlateRegistry:
+    """
+    indexed collection of wellplates, for constant time lookup
+
+    plates can be given either as Wellplate instances, or as dicts of Wellplate field values. the latter are only
+    validated into Wellplate instances on first access (per plate), so that processes that never look at the plate
+    catalog do not pay for constructing it.
+
+    Indexes:
+        - Model_id : unique, see get
+        - Model_id_manufacturer : see find_by_model_id_manufacturer (may be empty or shared between manufacturers)
+        - Num_total_wells : see find_by_num_wells
+        - Manufacturer : see find_by_manufacturer
+    """
+
+    def __init__(self, plates: tp.Iterable[tp.Union[Wellplate, tp.Dict[str, tp.Any]]]):
+        # insertion ordered. values are replaced by their Wellplate instance on first access
+        self._entries: tp.Dict[str, tp.Union[Wellplate, tp.Dict[str, tp.Any]]] = {}
+        self._plates: tp.Optional[tp.List[Wellplate]] = None
+        # Wellplate.content_hash by Model_id, computed on first use
+        self._content_hashes: tp.Dict[str, str] = {}
+
+        self._by_model_id_manufacturer: tp.Dict[str, tp.List[str]] = {}
+        self._by_num_wells: tp.Dict[int, tp.List[str]] = {}
+        self._by_manufacturer: tp.Dict[str, tp.List[str]] = {}
+
+        for plate in plates:
+            model_id = self._index_keys(plate)[0]
+            if model_id in self._entries:
+                raise ValueError(f"duplicate plate Model_id {model_id!r}")
+            self._index(plate)
+
+    @staticmethod
+    def _index_keys(plate: tp.Union[Wellplate, tp.Dict[str, tp.Any]]) -> tp.Tuple[str, str, int, str]:
+        " returns Model_id, Model_id_manufacturer, Num_total_wells, Manufacturer "
+        if isinstance(plate, Wellplate):
+            return plate.Model_id, plate.Model_id_manufacturer, plate.Num_total_wells, plate.Manufacturer
+
+        return (
+            plate["Model_id"],
+            plate["Model_id_manufacturer"],
+            plate["Num_wells_x"] * plate["Num_wells_y"],
+            plate["Manufacturer"],
+        )
+
+    def _index(self, plate: tp.Union[Wellplate, tp.Dict[str, tp.Any]]):
+        " add plate to all indexes. an existing entry with the same Model_id keeps its position "
+        model_id, model_id_manufacturer, num_total_wells, manufacturer = self._index_keys(plate)
+
+        self._entries[model_id] = plate
+        self._by_model_id_manufacturer.setdefault(model_id_manufacturer, []).append(model_id)
+        self._by_num_wells.setdefault(num_total_wells, []).append(model_id)
+        self._by_manufacturer.setdefault(manufacturer, []).append(model_id)
+
+    def _unindex(self, model_id: str):
+        " remove the plate with model_id from the secondary indexes "
+        _, model_id_manufacturer, num_total_wells, manufacturer = self._index_keys(self._entries[model_id])
+        self._by_model_id_manufacturer[model_id_manufacturer].remove(model_id)
+        self._by_num_wells[num_total_wells].remove(model_id)
+        self._by_manufacturer[manufacturer].remove(model_id)
+
+    def _materialize(self, model_id: str) -> Wellplate:
+        entry = self._entries[model_id]
+        if not isinstance(entry, Wellplate):
+            entry = Wellplate(**entry)
+            self._entries[model_id] = entry
+
+        return entry
+
+    @property
+    def plates(self) -> tp.List[Wellplate]:
+        """
+        list of all plates, in registration order
+
+        this creates all plates that have not been accessed yet. the same list object is returned on every call,
+        and kept up to date by register.
+        """
+
+        if self._plates is None:
+            self._plates = [self._materialize(model_id) for model_id in self._entries]
+
+        return self._plates
+
+    def register(self, plate: Wellplate, replace: bool = False):
+        """
+        add a plate (e.g. a site-local plate that is not part of the package) to the registry
+
+        raises ValueError if a plate with the same Model_id is already registered, unless replace is True,
+        in which case the existing plate is replaced (keeping its position in the plates list).
+        """
+
+        if plate.Model_id in self._entries:
+            if not replace:
+                raise ValueError(f"plate with Model_id {plate.Model_id!r} is already registered")
+
+            self._unindex(plate.Model_id)
+            self._content_hashes.pop(plate.Model_id, None)
+            if self._plates is not None:
+                position = list(self._entries).index(plate.Model_id)
+                self._plates[position] = plate
+        elif self._plates is not None:
+            self._plates.append(plate)
+
+        self._index(plate)
+
+    def get(self, model_id: str) -> tp.Optional[Wellplate]:
+        " get plate by Model_id, or None if there is no such plate "
+        if model_id not in self._entries:
+            return None
+        return self._materialize(model_id)
+
+    def __getitem__(self, model_id: str) -> Wellplate:
+        " get plate by Model_id, raises KeyError if there is no such plate "
+        return self._materialize(model_id)
+
+    def __contains__(self, model_id: str) -> bool:
+        return model_id in self._entries
+
+    def __iter__(self) -> tp.Iterator[Wellplate]:
+        return iter(self.plates)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def content_hash(self, model_id: str) -> str:
+        " Wellplate.content_hash of the plate with model_id (cached), raises KeyError if there is no such plate "
+        content_hash = self._content_hashes.get(model_id)
+        if content_hash is None:
+            content_hash = self._materialize(model_id).content_hash()
+            self._content_hashes[model_id] = content_hash
+        return content_hash
+
+    def resolve(self, model_id: str, content_hash: str) -> tp.Optional[Wellplate]:
+        """
+        get a copy of the plate with model_id if its content hash is content_hash, otherwise None
+
+        the plate is copied (without validating it again), so that modifying the returned plate cannot change the
+        registered plate, nor make it disagree with its cached content hash.
+        """
+
+        if model_id not in self._entries or self.content_hash(model_id) != content_hash:
+            return None
+        return self._materialize(model_id).model_copy()
+
+    def reference(self, plate: Wellplate, embed_fallback: bool = False) -> tp.Optional[WellplateReference]:
+        """
+        reference to the registered plate that is identical to plate, or None if there is no such plate
+
+        if embed_fallback is True, the reference includes a copy of plate (see WellplateReference.fallback).
+        """
+
+        known_plate = self.get(plate.Model_id)
+        if known_plate is None or (known_plate is not plate and known_plate != plate):
+            return None
+        return WellplateReference(
+            Model_id=plate.Model_id,
+            content_hash=self.content_hash(plate.Model_id),
+            fallback=plate if embed_fallback else None,
+        )
+
+    def find_by_model_id_manufacturer(self, model_id_manufacturer: str) -> tp.List[Wellplate]:
+        return [self._materialize(model_id) for model_id in self._by_model_id_manufacturer.get(model_id_manufacturer, ())]
+
+    def find_by_num_wells(self, num_total_wells: int) -> tp.List[Wellplate]:
+        return [self._materialize(model_id) for model_id in self._by_num_wells.get(num_total_wells, ())]
+
+    def find_by_manufacturer(self, manufacturer: str) -> tp.List[Wellplate]:
+        return [self._materialize(model_id) for model_id in self._by_manufacturer.get(manufacturer, ())]
+
+plate_registry = PlateRegistry(_PLATE_DATA)
+""" registry of known wellplates """
+
+def __getattr__(name: str):
+    # Plates is created on first access, see PlateRegistry.plates
+    if name == "Plates":
+        return plate_registry.plates
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
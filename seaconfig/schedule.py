@@ -0,0 +1,132 @@
+"""
+compilation of the enabled channels of an acquisition into the sequence of images taken at each site
+
+the z planes of a channel are centered on its z_offset_um, i.e. plane i (of n) is at
+z_offset_um + (i - (n - 1) / 2) * delta_z_um, relative to the focus plane of the site.
+
+images are grouped by filter, so that the filter wheel moves at most once per filter and site. within a filter, all
+planes (of all channels using that filter) are visited in monotonic z order, alternating between ascending and
+descending between filters, so that the focus does not jump back to the bottom of the stack for every filter.
+
+the schedule only depends on the channels, so it is compiled once per acquisition and reused for every site and
+timepoint (see compile_channel_schedule, ChannelSchedule.iter_plan).
+"""
+
+import typing as tp
+import functools
+
+from .acquisition import AcquisitionChannelConfig, AcquisitionConfig
+from .plan import AcquisitionPlan, PlannedSite
+
+class ScheduleStep(tp.NamedTuple):
+    """
+    one image at a site
+
+    Fields:
+        channel_index:int - index of the channel in the list of channels the schedule was compiled from
+        channel_handle:str - handle of the channel
+        filter_handle:tp.Optional[str] - filter to use, or None for no filter wheel movement
+        z_um:float - z position relative to the focus plane of the site [um]
+        exposure_time_ms:float - exposure time [ms]
+        illum_perc:float - illumination intensity [%]
+        analog_gain:float - analog gain
+    """
+
+    channel_index: int
+    channel_handle: str
+    filter_handle: tp.Optional[str]
+    z_um: float
+    exposure_time_ms: float
+    illum_perc: float
+    analog_gain: float
+
+class ChannelSchedule:
+    """
+    precompiled sequence of images taken at every site
+
+    use compile_channel_schedule to get a (shared) instance. the steps are immutable, and the same tuple is used for
+    all sites and timepoints.
+    """
+
+    def __init__(self, steps: tp.Sequence[ScheduleStep]):
+        self.steps: tp.Tuple[ScheduleStep, ...] = tuple(steps)
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def __iter__(self) -> tp.Iterator[ScheduleStep]:
+        return iter(self.steps)
+
+    def __getitem__(self, index: int) -> ScheduleStep:
+        return self.steps[index]
+
+    @functools.cached_property
+    def num_filter_changes(self) -> int:
+        " number of filter wheel moves within one site (not counting the move to the first filter) "
+        return sum(a.filter_handle != b.filter_handle for a, b in zip(self.steps, self.steps[1:]))
+
+    @functools.cached_property
+    def z_travel_um(self) -> float:
+        " total z distance moved within one site (not counting the move to the first plane) [um] "
+        return sum(abs(b.z_um - a.z_um) for a, b in zip(self.steps, self.steps[1:]))
+
+    def iter_plan(
+        self,
+        plan: AcquisitionPlan,
+        num_timepoints: int = 1,
+    ) -> tp.Iterator[tp.Tuple[int, PlannedSite, tp.Tuple[ScheduleStep, ...]]]:
+        " yields (timepoint, site, steps) for every site of plan in every timepoint. steps is the same tuple every time. "
+        steps = self.steps
+        for timepoint in range(num_timepoints):
+            for site in plan:
+                yield timepoint, site, steps
+
+    def __repr__(self) -> str:
+        return f"ChannelSchedule(steps={len(self.steps)}, filter_changes={self.num_filter_changes}, z_travel_um={self.z_travel_um:g})"
+
+_ChannelKey = tp.Tuple[int, str, tp.Optional[str], float, int, float, float, float, float]
+
+def _channel_key(index: int, channel: AcquisitionChannelConfig) -> _ChannelKey:
+    return (
+        index,
+        channel.handle,
+        channel.filter_handle,
+        channel.z_offset_um,
+        channel.num_z_planes,
+        channel.delta_z_um,
+        channel.exposure_time_ms,
+        channel.illum_perc,
+        channel.analog_gain,
+    )
+
+@functools.lru_cache(maxsize=64)
+def _compile(channels: tp.Tuple[_ChannelKey, ...]) -> ChannelSchedule:
+    # filters in order of first use, so that the user controls which filter comes first
+    groups: tp.Dict[tp.Optional[str], tp.List[ScheduleStep]] = {}
+    for index, handle, filter_handle, z_offset_um, num_z_planes, delta_z_um, exposure_time_ms, illum_perc, analog_gain in channels:
+        group = groups.setdefault(filter_handle, [])
+        for plane in range(num_z_planes):
+            z_um = z_offset_um + (plane - (num_z_planes - 1) / 2) * delta_z_um
+            group.append(ScheduleStep(index, handle, filter_handle, z_um, exposure_time_ms, illum_perc, analog_gain))
+
+    steps: tp.List[ScheduleStep] = []
+    for i, group in enumerate(groups.values()):
+        # sort is stable, so images at the same z keep their channel order
+        group.sort(key=lambda step: step.z_um, reverse=i % 2 == 1)
+        steps.extend(group)
+
+    return ChannelSchedule(steps)
+
+def compile_channel_schedule(
+    channels: tp.Union[AcquisitionConfig, tp.Sequence[AcquisitionChannelConfig]],
+) -> ChannelSchedule:
+    """
+    compile the enabled channels (of an AcquisitionConfig, or a list of channels) into the sequence of images taken at each site
+
+    schedules are cached by channel values, so compiling the channels of the same protocol again is cheap.
+    """
+
+    if isinstance(channels, AcquisitionConfig):
+        channels = channels.channels
+
+    return _compile(tuple(_channel_key(i, channel) for i, channel in enumerate(channels) if channel.enabled))
@@ -0,0 +1,148 @@
+import typing as tp
+import base64
+
+from pydantic import BaseModel, ConfigDict, PrivateAttr, model_validator
+
+from .acquisition import AcquisitionConfig, AcquisitionWellSiteConfigurationSiteSelectionItem, PlateWellConfig
+
+class _SelectionItem(tp.Protocol):
+    row: int
+    col: int
+    selected: bool
+
+_Item = tp.TypeVar("_Item", PlateWellConfig, AcquisitionWellSiteConfigurationSiteSelectionItem)
+
+class SelectionBitmap(BaseModel):
+    """
+    compact, immutable selection of cells in a grid (e.g. wells on a plate, or sites in a well site grid), stored as a bitset
+
+    this is an alternative encoding of AcquisitionConfig.plate_wells and AcquisitionWellSiteConfiguration.mask, which
+    store one model instance per cell. the bits of a selection on a 1536-well plate are 256 base64 characters.
+
+    Fields:
+        num_rows:int - number of rows in the grid
+        num_cols:int - number of columns in the grid
+        bits:str - base64 encoding of the bitset, in little endian byte order. the bit for cell (row,col) is bit number row*num_cols+col.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    num_rows: int
+    num_cols: int
+    bits: str
+
+    _value: int = PrivateAttr(0)
+
+    @model_validator(mode="after")
+    def _decode_bits(self) -> "SelectionBitmap":
+        value = int.from_bytes(base64.b64decode(self.bits, validate=True), "little")
+        if value.bit_length() > self.num_rows * self.num_cols:
+            raise ValueError(f"bitmap has bits set outside of its {self.num_rows}x{self.num_cols} grid")
+        self._value = value
+        return self
+
+    @classmethod
+    def from_int(cls, num_rows: int, num_cols: int, value: int) -> "SelectionBitmap":
+        " create from an integer with bit number row*num_cols+col set for every selected cell (row,col) "
+        num_bytes = (num_rows * num_cols + 7) // 8
+        bits = base64.b64encode(value.to_bytes(num_bytes, "little")).decode("ascii")
+        return cls(num_rows=num_rows, num_cols=num_cols, bits=bits)
+
+    @classmethod
+    def from_bytes(cls, num_rows: int, num_cols: int, data: tp.Union[bytes, bytearray, memoryview]) -> "SelectionBitmap":
+        " inverse of to_bytes "
+        return cls.from_int(num_rows, num_cols, int.from_bytes(data, "little"))
+
+    @classmethod
+    def from_indices(cls, num_rows: int, num_cols: int, indices: tp.Iterable[tp.Tuple[int, int]]) -> "SelectionBitmap":
+        " create from (row,col) indices of the selected cells "
+        value = 0
+        for row, col in indices:
+            if not (0 <= row < num_rows and 0 <= col < num_cols):
+                raise ValueError(f"cell ({row},{col}) is outside of the {num_rows}x{num_cols} grid")
+            value |= 1 << (row * num_cols + col)
+        return cls.from_int(num_rows, num_cols, value)
+
+    @classmethod
+    def from_items(cls, num_rows: int, num_cols: int, items: tp.Iterable[_SelectionItem]) -> "SelectionBitmap":
+        " create from a list of PlateWellConfig or AcquisitionWellSiteConfigurationSiteSelectionItem "
+        return cls.from_indices(num_rows, num_cols, ((item.row, item.col) for item in items if item.selected))
+
+    def to_items(self, item_type: tp.Type[_Item]) -> tp.List[_Item]:
+        """
+        convert to list of item_type (PlateWellConfig or AcquisitionWellSiteConfigurationSiteSelectionItem), with one
+        item for every cell in the grid, in row-major order
+        """
+
+        value = self._value
+        num_cols = self.num_cols
+        return [
+            item_type(row=row, col=col, selected=bool(value >> (row * num_cols + col) & 1))
+            for row in range(self.num_rows)
+            for col in range(num_cols)
+        ]
+
+    def to_int(self) -> int:
+        return self._value
+
+    def to_bytes(self) -> bytes:
+        " raw bitset, in little endian byte order, (num_rows*num_cols+7)//8 bytes long "
+        return self._value.to_bytes((self.num_rows * self.num_cols + 7) // 8, "little")
+
+    def count(self) -> int:
+        " number of selected cells "
+        return self._value.bit_count()
+
+    def __contains__(self, index: tp.Tuple[int, int]) -> bool:
+        row, col = index
+        if not (0 <= row < self.num_rows and 0 <= col < self.num_cols):
+            return False
+        return bool(self._value >> (row * self.num_cols + col) & 1)
+
+    def indices(self) -> tp.Iterator[tp.Tuple[int, int]]:
+        " iterate over (row,col) indices of the selected cells, in row-major order "
+        value = self._value
+        num_cols = self.num_cols
+        while value:
+            lowest = value & -value
+            yield divmod(lowest.bit_length() - 1, num_cols)
+            value ^= lowest
+
+    def _check_compatible(self, other: "SelectionBitmap"):
+        if (self.num_rows, self.num_cols) != (other.num_rows, other.num_cols):
+            raise ValueError(
+                f"cannot combine {self.num_rows}x{self.num_cols} selection with {other.num_rows}x{other.num_cols} selection"
+            )
+
+    def __or__(self, other: "SelectionBitmap") -> "SelectionBitmap":
+        self._check_compatible(other)
+        return SelectionBitmap.from_int(self.num_rows, self.num_cols, self._value | other._value)
+
+    def __and__(self, other: "SelectionBitmap") -> "SelectionBitmap":
+        self._check_compatible(other)
+        return SelectionBitmap.from_int(self.num_rows, self.num_cols, self._value & other._value)
+
+    def __xor__(self, other: "SelectionBitmap") -> "SelectionBitmap":
+        self._check_compatible(other)
+        return SelectionBitmap.from_int(self.num_rows, self.num_cols, self._value ^ other._value)
+
+    def __sub__(self, other: "SelectionBitmap") -> "SelectionBitmap":
+        self._check_compatible(other)
+        return SelectionBitmap.from_int(self.num_rows, self.num_cols, self._value & ~other._value)
+
+    def __invert__(self) -> "SelectionBitmap":
+        full = (1 << (self.num_rows * self.num_cols)) - 1
+        return SelectionBitmap.from_int(self.num_rows, self.num_cols, self._value ^ full)
+
+    union = __or__
+    intersection = __and__
+    difference = __sub__
+
+def get_well_selection(config: AcquisitionConfig) -> SelectionBitmap:
+    " get selection of plate wells of config (set config.plate_wells=selection.to_items(PlateWellConfig) for the reverse) "
+    plate = config.wellplate_type
+    return SelectionBitmap.from_items(plate.Num_wells_y, plate.Num_wells_x, config.plate_wells)
+
+def get_site_selection(config: AcquisitionConfig) -> SelectionBitmap:
+    " get selection of sites in the site grid of config (set config.grid.mask=selection.to_items(AcquisitionWellSiteConfigurationSiteSelectionItem) for the reverse) "
+    return SelectionBitmap.from_items(config.grid.num_y, config.grid.num_x, config.grid.mask)
@@ -0,0 +1,217 @@
+"""
+scheduling of the timepoints of a time-lapse acquisition (AcquisitionWellSiteConfiguration.num_t and delta_t)
+
+timepoint i is due at start + i * delta_t. deadlines are computed from the index (not by adding up delta_t), so there
+is no cumulative float error, and a timepoint that finishes late does not delay the deadlines of later timepoints.
+
+timepoints are produced lazily, so a run with any number of timepoints does not allocate its timeline up front.
+both blocking (iter_timepoints) and asyncio (aiter_timepoints) iteration are supported.
+"""
+
+import typing as tp
+import time
+
+from .acquisition import AcquisitionConfig, AcquisitionWellSiteConfiguration
+from .estimate import delta_t_seconds
+from .plan import AcquisitionPlan, PlannedSite
+
+class Timepoint(tp.NamedTuple):
+    """
+    a timepoint that is due to start
+
+    Fields:
+        index:int - index of the timepoint, starting at 0
+        deadline_s:float - time at which the timepoint is due to start (clock time) [s]
+        started_s:float - time at which the timepoint was started (clock time) [s]
+    """
+
+    index: int
+    deadline_s: float
+    started_s: float
+
+    @property
+    def lateness_s(self) -> float:
+        " time the timepoint was started after its deadline (0 if on time) [s] "
+        return max(0.0, self.started_s - self.deadline_s)
+
+class TimepointRecord(tp.NamedTuple):
+    """
+    a finished timepoint
+
+    Fields:
+        index:int - index of the timepoint, starting at 0
+        deadline_s:float - time at which the timepoint was due to start [s]
+        started_s:float - time at which the timepoint was started [s]
+        finished_s:float - time at which the timepoint was finished, i.e. when the next timepoint was requested [s]
+        next_deadline_s:tp.Optional[float] - deadline of the next timepoint, None for the last timepoint
+    """
+
+    index: int
+    deadline_s: float
+    started_s: float
+    finished_s: float
+    next_deadline_s: tp.Optional[float]
+
+    @property
+    def lateness_s(self) -> float:
+        " time the timepoint was started after its deadline (0 if on time) [s] "
+        return max(0.0, self.started_s - self.deadline_s)
+
+    @property
+    def duration_s(self) -> float:
+        return self.finished_s - self.started_s
+
+    @property
+    def slack_s(self) -> tp.Optional[float]:
+        " time between finishing and the next deadline (negative if the next timepoint will be late), None for the last timepoint "
+        if self.next_deadline_s is None:
+            return None
+        return self.next_deadline_s - self.finished_s
+
+class TimepointStats:
+    """
+    running summary of all finished timepoints (constant size, independent of the number of timepoints)
+
+    Fields:
+        num_finished:int - number of finished timepoints
+        num_late:int - number of timepoints that were started after their deadline
+        total_lateness_s:float - sum of lateness over all timepoints [s]
+        max_lateness_s:float - largest lateness of any timepoint [s]
+        min_slack_s:tp.Optional[float] - smallest slack of any timepoint (see TimepointRecord.slack_s), None if not known yet [s]
+    """
+
+    def __init__(self):
+        self.num_finished = 0
+        self.num_late = 0
+        self.total_lateness_s = 0.0
+        self.max_lateness_s = 0.0
+        self.min_slack_s: tp.Optional[float] = None
+
+    def add(self, record: TimepointRecord):
+        self.num_finished += 1
+        lateness_s = record.lateness_s
+        if lateness_s > 0:
+            self.num_late += 1
+            self.total_lateness_s += lateness_s
+            self.max_lateness_s = max(self.max_lateness_s, lateness_s)
+
+        slack_s = record.slack_s
+        if slack_s is not None and (self.min_slack_s is None or slack_s < self.min_slack_s):
+            self.min_slack_s = slack_s
+
+    def __repr__(self) -> str:
+        return (
+            f"TimepointStats(num_finished={self.num_finished}, num_late={self.num_late}, "
+            f"max_lateness_s={self.max_lateness_s:g}, min_slack_s={self.min_slack_s})"
+        )
+
+class TimepointScheduler:
+    """
+    produces the timepoints of a time-lapse acquisition when they are due
+
+    iterating waits until each timepoint is due, and then yields a Timepoint. a timepoint is considered finished when
+    the next one is requested (or when the iteration ends), at which point its TimepointRecord is added to stats and
+    passed to on_timepoint_finished (if given).
+
+    clock and sleep can be replaced, e.g. for simulation. clock must be monotonic.
+    """
+
+    def __init__(
+        self,
+        num_t: int,
+        delta_t_s: float,
+        start_s: tp.Optional[float] = None,
+        clock: tp.Callable[[], float] = time.monotonic,
+        sleep: tp.Callable[[float], tp.Any] = time.sleep,
+        on_timepoint_finished: tp.Optional[tp.Callable[[TimepointRecord], tp.Any]] = None,
+    ):
+        """
+        start_s is the deadline of the first timepoint (clock time). if None, the first timepoint is due when iteration starts.
+        """
+
+        if num_t < 0:
+            raise ValueError(f"num_t must not be negative, got {num_t}")
+        if delta_t_s < 0:
+            raise ValueError(f"delta_t_s must not be negative, got {delta_t_s}")
+
+        self.num_t = num_t
+        self.delta_t_s = delta_t_s
+        self.start_s = start_s
+        self.clock = clock
+        self.sleep = sleep
+        self.on_timepoint_finished = on_timepoint_finished
+        self.stats = TimepointStats()
+
+    @classmethod
+    def from_config(
+        cls,
+        config: tp.Union[AcquisitionConfig, AcquisitionWellSiteConfiguration],
+        **kwargs: tp.Any,
+    ) -> "TimepointScheduler":
+        " scheduler for grid.num_t timepoints, grid.delta_t apart. kwargs are passed to the constructor "
+        grid = config.grid if isinstance(config, AcquisitionConfig) else config
+        return cls(grid.num_t, delta_t_seconds(grid.delta_t), **kwargs)
+
+    def deadline(self, index: int) -> float:
+        " deadline of timepoint index (clock time) [s]. requires start_s to be set (it is set when iteration starts) "
+        if self.start_s is None:
+            raise ValueError("start_s is not known before iteration starts")
+        return self.start_s + index * self.delta_t_s
+
+    def _finish(self, timepoint: Timepoint):
+        next_index = timepoint.index + 1
+        record = TimepointRecord(
+            timepoint.index,
+            timepoint.deadline_s,
+            timepoint.started_s,
+            self.clock(),
+            self.deadline(next_index) if next_index < self.num_t else None,
+        )
+        self.stats.add(record)
+        if self.on_timepoint_finished is not None:
+            self.on_timepoint_finished(record)
+
+    def iter_timepoints(self) -> tp.Iterator[Timepoint]:
+        " yields each timepoint when it is due, blocking (with sleep) until then "
+        if self.start_s is None:
+            self.start_s = self.clock()
+
+        for index in range(self.num_t):
+            deadline_s = self.deadline(index)
+            wait_s = deadline_s - self.clock()
+            if wait_s > 0:
+                self.sleep(wait_s)
+
+            timepoint = Timepoint(index, deadline_s, self.clock())
+            yield timepoint
+            self._finish(timepoint)
+
+    async def aiter_timepoints(self) -> tp.AsyncIterator[Timepoint]:
+        " like iter_timepoints, but waits with asyncio.sleep instead of blocking "
+        # imported here, so that importing seaconfig does not import asyncio
+        import asyncio
+
+        if self.start_s is None:
+            self.start_s = self.clock()
+
+        for index in range(self.num_t):
+            deadline_s = self.deadline(index)
+            wait_s = deadline_s - self.clock()
+            if wait_s > 0:
+                await asyncio.sleep(wait_s)
+
+            timepoint = Timepoint(index, deadline_s, self.clock())
+            yield timepoint
+            self._finish(timepoint)
+
+    def iter_plan(self, plan: AcquisitionPlan) -> tp.Iterator[tp.Tuple[Timepoint, PlannedSite]]:
+        " yields (timepoint, site) for every site of plan in every timepoint, waiting for each timepoint to be due "
+        for timepoint in self.iter_timepoints():
+            for site in plan:
+                yield timepoint, site
+
+    async def aiter_plan(self, plan: AcquisitionPlan) -> tp.AsyncIterator[tp.Tuple[Timepoint, PlannedSite]]:
+        " like iter_plan, but waits with asyncio.sleep instead of blocking "
+        async for timepoint in self.aiter_timepoints():
+            for site in plan:
+                yield timepoint, site
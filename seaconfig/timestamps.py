@@ -0,0 +1,133 @@
+"""
+formatting and parsing of utc timestamps in the protocol timestamp format YYYY-MM-DD_HH.MM.SS (see datetime2str)
+
+formatting is cached per second: the formatted text of the most recent second is reused until the second changes,
+so formatting many timestamps within the same second (e.g. one per image) does not call strftime every time.
+
+timestamps can optionally have sub-second resolution, to keep e.g. file names unique at high frame rates. the
+fraction is appended after a dot, e.g. 2024-01-31_12.30.05.123 with 3 digits. the fraction is truncated to the
+requested digits, not rounded. times given as seconds since the epoch (float) are first rounded to whole microseconds
+(so that e.g. 0.1, which is stored as 0.09999.., gives .1), which can carry into the next second: 1.9999999 with 3
+digits is formatted as ..02.000.
+"""
+
+import typing as tp
+import math
+from datetime import datetime, timedelta, timezone
+
+TIMESTAMP_FORMAT = "%Y-%m-%d_%H.%M.%S"
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_SECOND = timedelta(seconds=1)
+
+def _split_epoch(epoch_s: float) -> tp.Tuple[int, int]:
+    " (second, microsecond) of seconds since the unix epoch. rounds to microseconds first, so that e.g. 0.1 gives 100000 "
+    second = math.floor(epoch_s)
+    microsecond = round((epoch_s - second) * 1_000_000)
+    if microsecond == 1_000_000:
+        return second + 1, 0
+    return second, microsecond
+
+class TimestampFormatter:
+    """
+    formats timestamps, caching the formatted text of the most recent second
+
+    safe to use from multiple threads (the cache is a single (second, text) tuple, which is replaced atomically).
+    """
+
+    def __init__(self):
+        self._cache: tp.Tuple[int, str] = (0, datetime.fromtimestamp(0, timezone.utc).strftime(TIMESTAMP_FORMAT))
+
+    def _format_second(self, second: int) -> str:
+        cached_second, text = self._cache
+        if cached_second != second:
+            text = datetime.fromtimestamp(second, timezone.utc).strftime(TIMESTAMP_FORMAT)
+            self._cache = (second, text)
+        return text
+
+    def format_epoch(self, epoch_s: float, digits: int = 0) -> str:
+        " format seconds since the unix epoch, with digits sub-second digits (0 to 6) "
+        second, microsecond = _split_epoch(epoch_s)
+        text = self._format_second(second)
+        if digits > 0:
+            text = f"{text}.{microsecond // 10 ** (6 - digits):0{digits}d}"
+        return text
+
+    def format(self, dt: datetime, digits: int = 0) -> str:
+        """
+        format a datetime (converted to utc), with digits sub-second digits (0 to 6)
+
+        naive datetimes are interpreted as local time, like datetime.astimezone does.
+        """
+
+        if dt.tzinfo is not None and dt.utcoffset() is not None:
+            # exact integer arithmetic, and faster than timestamp()
+            second = (dt - _EPOCH) // _ONE_SECOND
+        else:
+            # local time. replace(microsecond=0) makes timestamp() an exact integer
+            second = int(dt.replace(microsecond=0).timestamp())
+        text = self._format_second(second)
+        if digits > 0:
+            fraction = dt.microsecond // 10 ** (6 - digits)
+            text = f"{text}.{fraction:0{digits}d}"
+        return text
+
+    def format_many(self, epochs_s: tp.Iterable[float], digits: int = 0) -> tp.List[str]:
+        """
+        format many times (seconds since the unix epoch) at once
+
+        consecutive times within the same second share the formatted text, so sorted (or mostly sorted) inputs are cheapest.
+        """
+
+        divisor = 10 ** (6 - digits)
+        ret = []
+        cached_second = None
+        text = ""
+        for epoch_s in epochs_s:
+            second, microsecond = _split_epoch(epoch_s)
+            if second != cached_second:
+                cached_second = second
+                text = self._format_second(second)
+            if digits > 0:
+                ret.append(f"{text}.{microsecond // divisor:0{digits}d}")
+            else:
+                ret.append(text)
+        return ret
+
+_formatter = TimestampFormatter()
+
+def format_timestamp(value: tp.Union[datetime, float], digits: int = 0) -> str:
+    """
+    format a datetime, or seconds since the unix epoch, as utc timestamp YYYY-MM-DD_HH.MM.SS
+
+    if digits > 0 (up to 6), that many sub-second digits are appended, e.g. YYYY-MM-DD_HH.MM.SS.fff for digits=3.
+    """
+
+    if not 0 <= digits <= 6:
+        raise ValueError(f"digits must be between 0 and 6, got {digits}")
+    if isinstance(value, datetime):
+        return _formatter.format(value, digits)
+    return _formatter.format_epoch(value, digits)
+
+def format_timestamps(epochs_s: tp.Iterable[float], digits: int = 0) -> tp.List[str]:
+    " format many times (seconds since the unix epoch), see format_timestamp and TimestampFormatter.format_many "
+    if not 0 <= digits <= 6:
+        raise ValueError(f"digits must be between 0 and 6, got {digits}")
+    return _formatter.format_many(epochs_s, digits)
+
+def parse_timestamp(text: str) -> datetime:
+    """
+    parse a timestamp written by format_timestamp (or datetime2str), with or without sub-second digits
+
+    returns a timezone aware datetime in utc. raises ValueError if text is not in this format.
+    """
+
+    if len(text) > 19:
+        if text[19] != "." or not text[20:].isdigit() or len(text) > 26:
+            raise ValueError(f"invalid timestamp {text!r}")
+        microsecond = int(text[20:].ljust(6, "0"))
+        text = text[:19]
+    else:
+        microsecond = 0
+
+    return datetime.strptime(text, TIMESTAMP_FORMAT).replace(microsecond=microsecond, tzinfo=timezone.utc)
@@ -0,0 +1,162 @@
+"""
+batch validation of user supplied well names and config values
+
+instead of raising on the first invalid entry, all entries are checked, and the invalid ones are collected in a
+ValidationReport. issues only store what is needed to describe them (no message strings are built until a message
+is requested), so that validating large inputs with many invalid entries stays cheap.
+"""
+
+import typing as tp
+
+from .config_item import ConfigItem, ConfigItemCollection
+from .wellnames import get_well_name_table, try_parse_well_name
+from .wellplates import Wellplate
+
+_T = tp.TypeVar("_T")
+
+IssueReason = tp.Literal[
+    "invalid_well_name",
+    "invalid_row",
+    "invalid_col",
+    "unknown_handle",
+    "value_kind_mismatch",
+    "invalid_value",
+]
+
+_MESSAGES: tp.Dict[str, str] = {
+    "invalid_well_name": "invalid well name {value!r}",
+    "invalid_row": "well {value} is not in a valid row for plate {context}",
+    "invalid_col": "well {value} is not in a valid col for plate {context}",
+    "unknown_handle": "no config item with handle {context!r}",
+    "value_kind_mismatch": "on {context!r}: value_kind {value!r} does not match the known item",
+    "invalid_value": "on {context!r}: invalid value {value!r}",
+}
+
+class ValidationIssue(tp.NamedTuple):
+    """
+    one invalid entry
+
+    Fields:
+        index:int - position of the entry in the validated input
+        reason:IssueReason - kind of issue
+        value:tp.Any - offending value (e.g. the well name)
+        context:str - what the value was checked against (e.g. the plate Model_id, or the config item handle)
+    """
+
+    index: int
+    reason: IssueReason
+    value: tp.Any
+    context: str
+
+    @property
+    def message(self) -> str:
+        return _MESSAGES[self.reason].format(value=self.value, context=self.context)
+
+class ValidationReport(tp.Generic[_T]):
+    """
+    result of validating many entries
+
+    Fields:
+        valid:tp.List[_T] - validated values of all valid entries, in input order
+        issues:tp.List[ValidationIssue] - all invalid entries, in input order
+    """
+
+    def __init__(self, valid: tp.List[_T], issues: tp.List[ValidationIssue]):
+        self.valid = valid
+        self.issues = issues
+
+    @property
+    def ok(self) -> bool:
+        return len(self.issues) == 0
+
+    def summary(self, max_issues: int = 10) -> str:
+        " compact description of the issues, listing at most max_issues of them "
+        if self.ok:
+            return f"{len(self.valid)} valid entries"
+
+        lines = [f"{len(self.issues)} invalid entries ({len(self.valid)} valid):"]
+        lines.extend(f"  [{issue.index}] {issue.message}" for issue in self.issues[:max_issues])
+        if len(self.issues) > max_issues:
+            lines.append(f"  ... and {len(self.issues) - max_issues} more")
+        return "\n".join(lines)
+
+    def raise_if_invalid(self, max_issues: int = 10):
+        " raise a single ValueError describing all issues, if there are any "
+        if not self.ok:
+            raise ValueError(self.summary(max_issues=max_issues))
+
+    def __repr__(self) -> str:
+        return f"ValidationReport(valid={len(self.valid)}, issues={len(self.issues)})"
+
+def validate_well_names(plate: Wellplate, names: tp.Iterable[str]) -> ValidationReport[tp.Tuple[int, int]]:
+    """
+    check that all names are valid well names on plate
+
+    the valid entries of the report are the (row,col) indices of the valid names.
+    """
+
+    num_rows, num_cols = plate.Num_wells_y, plate.Num_wells_x
+    known = get_well_name_table(num_rows, num_cols).indices
+
+    valid: tp.List[tp.Tuple[int, int]] = []
+    issues: tp.List[ValidationIssue] = []
+    for i, name in enumerate(names):
+        index = known.get(name)
+        if index is not None:
+            valid.append(index)
+            continue
+
+        index = try_parse_well_name(name) if isinstance(name, str) else None
+        if index is None:
+            issues.append(ValidationIssue(i, "invalid_well_name", name, plate.Model_id))
+        elif index[0] >= num_rows:
+            issues.append(ValidationIssue(i, "invalid_row", name, plate.Model_id))
+        elif index[1] >= num_cols:
+            issues.append(ValidationIssue(i, "invalid_col", name, plate.Model_id))
+        else:
+            valid.append(index)
+
+    return ValidationReport(valid, issues)
+
+def _value_matches_kind(item: ConfigItem) -> bool:
+    value = item.value
+    kind = item.value_kind
+    if kind == "int":
+        return type(value) is int
+    if kind == "float":
+        return type(value) in (int, float)
+    if not isinstance(value, str):
+        return False
+    if kind == "option" and item.options is not None:
+        return any(option.handle == value for option in item.options)
+    return True
+
+def validate_config_items(
+    items: tp.Iterable[ConfigItem],
+    known: tp.Optional[ConfigItemCollection] = None,
+) -> ValidationReport[ConfigItem]:
+    """
+    check that the value of each item matches its value_kind (and, for options, is one of the options)
+
+    if known is given, additionally check that every item has a handle and value_kind matching an item in known.
+    """
+
+    valid: tp.List[ConfigItem] = []
+    issues: tp.List[ValidationIssue] = []
+    for i, item in enumerate(items):
+        if known is not None:
+            known_item = known.get(item.handle)
+            if known_item is None:
+                issues.append(ValidationIssue(i, "unknown_handle", item.value, item.handle))
+                continue
+            if known_item.value_kind != item.value_kind:
+                issues.append(ValidationIssue(i, "value_kind_mismatch", item.value_kind, item.handle))
+                continue
+
+        if not _value_matches_kind(item):
+            issues.append(ValidationIssue(i, "invalid_value", item.value, item.handle))
+            continue
+
+        valid.append(item)
+
+    return ValidationReport(valid, issues)
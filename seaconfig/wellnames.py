@@ -0,0 +1,120 @@
+"""
+conversion between well names (e.g. "B3", "AF48") and (row,col) well indices
+
+rows are named A to Z, then AA, AB, .. AZ, BA, .. (like spreadsheet columns), so plates with more than 26 rows
+(e.g. 1536-well plates, with rows A to AF) can be addressed. columns are numbered starting at 1.
+"""
+
+import typing as tp
+import functools
+import re
+
+_WELL_NAME_RE = re.compile(r"([A-Za-z]+)([0-9]+)")
+
+@functools.lru_cache(maxsize=256)
+def row_name(row: int) -> str:
+    " name of row with index row (starting at 0), e.g. 0 -> A, 25 -> Z, 26 -> AA "
+    if row < 0:
+        raise ValueError(f"row index must not be negative, got {row}")
+
+    name = ""
+    row += 1
+    while row > 0:
+        row, remainder = divmod(row - 1, 26)
+        name = chr(ord("A") + remainder) + name
+    return name
+
+def row_index(name: str) -> int:
+    " index of row with name (case insensitive), e.g. A -> 0, Z -> 25, AA -> 26 "
+    if not name.isalpha() or not name.isascii():
+        raise ValueError(f"invalid row name {name!r}")
+
+    index = 0
+    for letter in name.upper():
+        index = index * 26 + ord(letter) - ord("A") + 1
+    return index - 1
+
+@functools.lru_cache(maxsize=4096)
+def well_name(row: int, col: int) -> str:
+    " name of the well at (row,col) (both starting at 0), e.g. (1,2) -> B3 "
+    if col < 0:
+        raise ValueError(f"column index must not be negative, got {col}")
+    return f"{row_name(row)}{col + 1}"
+
+@functools.lru_cache(maxsize=4096)
+def try_parse_well_name(name: str) -> tp.Optional[tp.Tuple[int, int]]:
+    " like parse_well_name, but returns None instead of raising if the name is invalid "
+
+    match = _WELL_NAME_RE.fullmatch(name)
+    if match is None:
+        return None
+
+    col = int(match.group(2)) - 1
+    if col < 0:
+        return None
+
+    return row_index(match.group(1)), col
+
+def parse_well_name(name: str) -> tp.Tuple[int, int]:
+    """
+    (row,col) index (both starting at 0) of the well with name
+
+    name is '<row name, may be lower or uppercase><column number, starting at 1, may be padded by any number of zeroes>',
+    e.g. A1, A01, F05, O24, b3, AF48
+
+    raises ValueError if the name is not in this format. does not check if the well exists on any particular plate.
+    """
+
+    index = try_parse_well_name(name)
+    if index is None:
+        raise ValueError(f"invalid well name {name!r}")
+    return index
+
+class WellNameTable:
+    """
+    precomputed names of all wells on a plate with num_rows rows and num_cols columns
+
+    use get_well_name_table to get a (shared) instance.
+    """
+
+    def __init__(self, num_rows: int, num_cols: int):
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+
+        self.names: tp.List[str] = [well_name(row, col) for row in range(num_rows) for col in range(num_cols)]
+        " names of all wells, in row-major order "
+
+        self.indices: tp.Dict[str, tp.Tuple[int, int]] = {
+            name: divmod(i, num_cols) for i, name in enumerate(self.names)
+        }
+        " (row,col) index by canonical (uppercase, unpadded) well name "
+
+    def name(self, row: int, col: int) -> str:
+        if not (0 <= row < self.num_rows and 0 <= col < self.num_cols):
+            raise ValueError(f"well ({row},{col}) is not on a plate with {self.num_rows} rows and {self.num_cols} columns")
+        return self.names[row * self.num_cols + col]
+
+    def index(self, name: str) -> tp.Tuple[int, int]:
+        """
+        (row,col) index of the well with name. accepts any format that parse_well_name accepts.
+
+        raises ValueError if the name is invalid, or if the well is not on this plate.
+        """
+
+        index = self.indices.get(name)
+        if index is not None:
+            return index
+
+        row, col = parse_well_name(name)
+        if not (0 <= row < self.num_rows and 0 <= col < self.num_cols):
+            raise ValueError(f"well {name} is not on a plate with {self.num_rows} rows and {self.num_cols} columns")
+        return row, col
+
+    def parse(self, names: tp.Iterable[str]) -> tp.List[tp.Tuple[int, int]]:
+        " (row,col) indices of many wells at once (see index) "
+        indices = self.indices
+        return [indices.get(name) or self.index(name) for name in names]
+
+@functools.lru_cache(maxsize=32)
+def get_well_name_table(num_rows: int, num_cols: int) -> WellNameTable:
+    return WellNameTable(num_rows, num_cols)
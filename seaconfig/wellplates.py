@@ -1,5 +1,157 @@
+import typing as tp
+import functools
+import math
+import hashlib
+import json
+import time
+from array import array
+from dataclasses import dataclass
+
 from pydantic import BaseModel
 
+from . import instrumentation
+from .wellnames import get_well_name_table, parse_well_name
+
+WellSelector = tp.Union[str, tp.Tuple[int, int]]
+" a well, either by name (e.g. 'B3') or by (row,col) index tuple, both indices starting at 0 "
+
+class _SiteGrid(tp.Protocol):
+    " the fields of AcquisitionWellSiteConfiguration that describe the site grid "
+    num_x: int
+    delta_x_mm: float
+    num_y: int
+    delta_y_mm: float
+
+@dataclass(frozen=True)
+class WellPositionTable:
+    """
+    array-backed table of well positions on a plate, one entry per well
+
+    entries for a whole plate are in row-major order, i.e. the entry for (row,col) is at index row*Num_wells_x+col
+
+    the table for a whole plate (see Wellplate.get_well_positions) is shared between all plates with the same geometry,
+    so its columns are read-only memoryviews. tables returned by take own their columns, which are arrays.
+
+    Fields:
+        - row:array[int] : row index of the well, starting at 0
+        - col:array[int] : column index of the well, starting at 0
+        - x_mm:array[float] : offset of the top left corner of the well, in x [mm]
+        - y_mm:array[float] : offset of the top left corner of the well, in y [mm]
+        - center_x_mm:array[float] : offset of the center of the well, in x [mm]
+        - center_y_mm:array[float] : offset of the center of the well, in y [mm]
+    """
+
+    row: tp.Union[array, memoryview]
+    col: tp.Union[array, memoryview]
+    x_mm: tp.Union[array, memoryview]
+    y_mm: tp.Union[array, memoryview]
+    center_x_mm: tp.Union[array, memoryview]
+    center_y_mm: tp.Union[array, memoryview]
+
+    def __len__(self) -> int:
+        return len(self.row)
+
+    def take(self, indices: tp.Sequence[int]) -> "WellPositionTable":
+        """
+        return a new table containing only the entries at indices (in that order)
+        """
+
+        return WellPositionTable(
+            row=array("H", [self.row[i] for i in indices]),
+            col=array("H", [self.col[i] for i in indices]),
+            x_mm=array("d", [self.x_mm[i] for i in indices]),
+            y_mm=array("d", [self.y_mm[i] for i in indices]),
+            center_x_mm=array("d", [self.center_x_mm[i] for i in indices]),
+            center_y_mm=array("d", [self.center_y_mm[i] for i in indices]),
+        )
+
+@functools.lru_cache(maxsize=64)
+def _well_position_table(
+    num_wells_x: int,
+    num_wells_y: int,
+    offset_x_mm: float,
+    offset_y_mm: float,
+    distance_x_mm: float,
+    distance_y_mm: float,
+    size_x_mm: float,
+    size_y_mm: float,
+) -> WellPositionTable:
+    """
+    compute the positions of all wells on a plate with the given geometry
+
+    cached on the geometry (not on the plate instance), so that identical plates (e.g. loaded from different protocol files) share one table
+    """
+
+    col_x = [offset_x_mm + x * distance_x_mm for x in range(num_wells_x)]
+    row_y = [offset_y_mm + y * distance_y_mm for y in range(num_wells_y)]
+
+    x_mm = array("d", col_x * num_wells_y)
+    y_mm = array("d", [y for y in row_y for _ in range(num_wells_x)])
+
+    # the table is shared by all callers, so only read-only views of the arrays are handed out
+    return WellPositionTable(
+        row=memoryview(array("H", [y for y in range(num_wells_y) for _ in range(num_wells_x)])).toreadonly(),
+        col=memoryview(array("H", list(range(num_wells_x)) * num_wells_y)).toreadonly(),
+        x_mm=memoryview(x_mm).toreadonly(),
+        y_mm=memoryview(y_mm).toreadonly(),
+        center_x_mm=memoryview(array("d", [x + size_x_mm / 2 for x in x_mm])).toreadonly(),
+        center_y_mm=memoryview(array("d", [y + size_y_mm / 2 for y in y_mm])).toreadonly(),
+    )
+
+def _points_in_rounded_rect(
+    xs: tp.Iterable[float],
+    ys: tp.Iterable[float],
+    half_x_mm: float,
+    half_y_mm: float,
+    radius_mm: float,
+) -> tp.List[bool]:
+    " for each point (relative to the center of the rectangle), check if it is inside the rectangle with rounded corners (boundary included) "
+
+    radius_mm = max(0.0, min(radius_mm, half_x_mm, half_y_mm))
+    inner_x_mm = half_x_mm - radius_mm
+    inner_y_mm = half_y_mm - radius_mm
+    radius_sq = radius_mm * radius_mm
+
+    ret = []
+    for x, y in zip(xs, ys):
+        x = abs(x)
+        y = abs(y)
+        if x > half_x_mm or y > half_y_mm:
+            ret.append(False)
+        elif x <= inner_x_mm or y <= inner_y_mm:
+            ret.append(True)
+        else:
+            ret.append((x - inner_x_mm) ** 2 + (y - inner_y_mm) ** 2 <= radius_sq)
+    return ret
+
+@functools.lru_cache(maxsize=256)
+def _valid_site_mask(
+    size_x_mm: float,
+    size_y_mm: float,
+    edge_radius_mm: float,
+    num_x: int,
+    delta_x_mm: float,
+    num_y: int,
+    delta_y_mm: float,
+    fov_x_mm: float,
+    fov_y_mm: float,
+) -> tp.Tuple[bool, ...]:
+    """
+    check for each site of a site grid (centered on the well center) if its field of view is inside the well
+
+    cached on the geometry, like _well_position_table. a rectangle is inside the (convex) well iff all its corners are.
+    """
+
+    origin_x_mm = -(num_x - 1) * delta_x_mm / 2
+    origin_y_mm = -(num_y - 1) * delta_y_mm / 2
+    site_x = [origin_x_mm + col * delta_x_mm for _ in range(num_y) for col in range(num_x)]
+    site_y = [origin_y_mm + row * delta_y_mm for row in range(num_y) for _ in range(num_x)]
+
+    # corners furthest from the center are checked, the other corners are closer and therefore also inside
+    corner_x = [abs(x) + fov_x_mm / 2 for x in site_x]
+    corner_y = [abs(y) + fov_y_mm / 2 for y in site_y]
+    return tuple(_points_in_rounded_rect(corner_x, corner_y, size_x_mm / 2, size_y_mm / 2, edge_radius_mm))
+
 class Wellplate(BaseModel):
     """
     physical and meta characteristics of a wellplate
@@ -47,6 +199,11 @@ class Wellplate(BaseModel):
     Properties:
         - Num_total_wells : returns the total number of wells on this plate (equal to  Num_wells_x * Num_wells_y)
 
+    Methods:
+        - content_hash : hash of all field values, see WellplateReference
+        - get_well_bounds, points_in_well, wells_at, well_at : well geometry, including the rounded corners
+        - get_valid_site_mask : which sites of a well site grid fit into a well
+
     """
 
     Manufacturer: str
@@ -78,44 +235,215 @@ class Wellplate(BaseModel):
     def Num_total_wells(self):
         return self.Num_wells_y * self.Num_wells_x
 
+    def content_hash(self) -> str:
+        " sha256 (hex) of the canonical json of all fields. plates with equal field values have equal hashes. "
+        canonical = json.dumps(self.model_dump(mode="json"), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def _well_index(self, well: WellSelector) -> tp.Tuple[int, int]:
+        """
+        get (row,col) index of a well, given either by name or by index tuple
+
+        raises ValueError if either index is invalid on this plate
+        """
+
+        if isinstance(well, str):
+            index = get_well_name_table(self.Num_wells_y, self.Num_wells_x).indices.get(well)
+            if index is not None:
+                return index
+
+            well_name = well
+            well_y_index, well_x_index = parse_well_name(well)
+        else:
+            well_y_index, well_x_index = well
+            well_name = f"({well_y_index},{well_x_index})"
+
+        if not 0 <= well_y_index < self.Num_wells_y:
+            raise ValueError(f"well {well_name} is not in a valid row for plate {self.Model_id}")
+        if not 0 <= well_x_index < self.Num_wells_x:
+            raise ValueError(f"well {well_name} is not in a valid col for plate {self.Model_id}")
+
+        return well_y_index, well_x_index
+
+    def get_well_positions(self, wells: tp.Optional[tp.Iterable[WellSelector]] = None) -> WellPositionTable:
+        """
+        get the positions of many wells at once
+
+        the table for the whole plate is computed once and cached, so repeated calls (e.g. once per site) are cheap.
+
+        wells can be given by name (same format as for get_well_offset_x) or as (row,col) index tuples.
+        if wells is None, return the (shared, read-only) table for the whole plate (in row-major order), otherwise
+        return the entries for the given wells, in the order given.
+
+        raises an exception if any well is invalid on this plate
+        """
+
+        recorder = instrumentation.recorder
+        start_time = time.perf_counter() if recorder is not None else 0.0
+
+        table = _well_position_table(
+            self.Num_wells_x,
+            self.Num_wells_y,
+            self.Offset_A1_x_mm,
+            self.Offset_A1_y_mm,
+            self.Well_distance_x_mm,
+            self.Well_distance_y_mm,
+            self.Well_size_x_mm,
+            self.Well_size_y_mm,
+        )
+        if wells is not None:
+            num_wells_x = self.Num_wells_x
+            indices = []
+            for well in wells:
+                row, col = self._well_index(well)
+                indices.append(row * num_wells_x + col)
+            table = table.take(indices)
+
+        if recorder is not None:
+            recorder.record("wellplate.get_well_positions", time.perf_counter() - start_time)
+        return table
+
     def get_well_offset_x(self, well_name: str) -> float:
         """
         get the offset of the top left corner of the well with name well_name, on the x axis [mm]
 
-        well_name must be in format: '<row name as single letter, starting at A, may be lower or uppercase><column index, starting at 1, may be padded by any number of zeroes>'
-            - e.g. A1, A01, F05, O24, b3
+        well_name must be in format: '<row name, starting at A (after Z: AA, AB, ..), may be lower or uppercase><column index, starting at 1, may be padded by any number of zeroes>'
+            - e.g. A1, A01, F05, O24, b3, AF48
             - this function raises an exception if either index is invalid on this plate
-        """
 
-        well_name = well_name.upper()
-        well_row_name, well_col_name = well_name[:1], well_name[1:]
-        well_y_index = ord(well_row_name) - ord("A")
-        well_x_index = int(well_col_name) - 1
+        use get_well_positions to get the offsets of many wells at once.
+        """
 
-        if well_y_index >= self.Num_wells_y:
-            raise ValueError(f"well {well_name} is not in a valid row for plate {self}")
-        if well_x_index >= self.Num_wells_x:
-            raise ValueError(f"well {well_name} is not in a valid col for plate {self}")
+        recorder = instrumentation.recorder
+        if recorder is not None:
+            recorder.count("wellplate.get_well_offset")
 
+        _, well_x_index = self._well_index(well_name)
         return self.Offset_A1_x_mm + well_x_index * self.Well_distance_x_mm
 
     def get_well_offset_y(self, well_name: str) -> float:
         """
         get the offset of the top left corner of the well with name well_name, on the y axis [mm]
 
-        well_name must be in format: '<row name as single letter, starting at A, may be lower or uppercase><column index, starting at 1, may be padded by any number of zeroes>'
-            - e.g. A1, A01, F05, O24, b3
+        well_name must be in format: '<row name, starting at A (after Z: AA, AB, ..), may be lower or uppercase><column index, starting at 1, may be padded by any number of zeroes>'
+            - e.g. A1, A01, F05, O24, b3, AF48
             - this function raises an exception if either index is invalid on this plate
-        """
 
-        well_name = well_name.upper()
-        well_row_name, well_col_name = well_name[:1], well_name[1:]
-        well_y_index = ord(well_row_name) - ord("A")
-        well_x_index = int(well_col_name) - 1
+        use get_well_positions to get the offsets of many wells at once.
+        """
 
-        if well_y_index >= self.Num_wells_y:
-            raise ValueError(f"well {well_name} is not in a valid row for plate {self}")
-        if well_x_index >= self.Num_wells_x:
-            raise ValueError(f"well {well_name} is not in a valid col for plate {self}")
+        recorder = instrumentation.recorder
+        if recorder is not None:
+            recorder.count("wellplate.get_well_offset")
 
+        well_y_index, _ = self._well_index(well_name)
         return self.Offset_A1_y_mm + well_y_index * self.Well_distance_y_mm
+
+    def get_well_bounds(self, well: WellSelector) -> tp.Tuple[float, float, float, float]:
+        """
+        get the (x_min, y_min, x_max, y_max) bounds of a well [mm], in the same coordinates as get_well_offset_x
+
+        raises an exception if the well is invalid on this plate
+        """
+
+        row, col = self._well_index(well)
+        x_mm = self.Offset_A1_x_mm + col * self.Well_distance_x_mm
+        y_mm = self.Offset_A1_y_mm + row * self.Well_distance_y_mm
+        return x_mm, y_mm, x_mm + self.Well_size_x_mm, y_mm + self.Well_size_y_mm
+
+    def points_in_well(self, well: WellSelector, xs_mm: tp.Iterable[float], ys_mm: tp.Iterable[float]) -> tp.List[bool]:
+        """
+        for each point (xs_mm[i], ys_mm[i]), check if it is inside the well (including the rounded corners, see Well_edge_radius_mm)
+
+        coordinates are in the same coordinates as get_well_offset_x. raises an exception if the well is invalid on this plate
+        """
+
+        x_min, y_min, x_max, y_max = self.get_well_bounds(well)
+        center_x_mm = (x_min + x_max) / 2
+        center_y_mm = (y_min + y_max) / 2
+        return _points_in_rounded_rect(
+            (x - center_x_mm for x in xs_mm),
+            (y - center_y_mm for y in ys_mm),
+            self.Well_size_x_mm / 2,
+            self.Well_size_y_mm / 2,
+            self.Well_edge_radius_mm,
+        )
+
+    def wells_at(self, xs_mm: tp.Iterable[float], ys_mm: tp.Iterable[float]) -> tp.List[tp.Optional[tp.Tuple[int, int]]]:
+        """
+        for each point (xs_mm[i], ys_mm[i]), get the (row,col) index of the well containing it, or None if the point is
+        not inside any well (e.g. between wells, in a rounded corner, or outside the plate)
+
+        coordinates are in the same coordinates as get_well_offset_x. each lookup is constant time (the candidate well
+        is computed from the well pitch).
+        """
+
+        offset_x_mm, offset_y_mm = self.Offset_A1_x_mm, self.Offset_A1_y_mm
+        distance_x_mm, distance_y_mm = self.Well_distance_x_mm, self.Well_distance_y_mm
+        num_wells_x, num_wells_y = self.Num_wells_x, self.Num_wells_y
+        half_x_mm, half_y_mm = self.Well_size_x_mm / 2, self.Well_size_y_mm / 2
+
+        # an axis with a single well (or zero pitch, e.g. single holders) has no pitch to divide by, index 0 is used instead
+        single_col = num_wells_x == 1 or distance_x_mm == 0
+        single_row = num_wells_y == 1 or distance_y_mm == 0
+
+        candidates: tp.List[tp.Optional[tp.Tuple[int, int]]] = []
+        relative_x: tp.List[float] = []
+        relative_y: tp.List[float] = []
+        for x, y in zip(xs_mm, ys_mm):
+            col = 0 if single_col else math.floor((x - offset_x_mm) / distance_x_mm)
+            row = 0 if single_row else math.floor((y - offset_y_mm) / distance_y_mm)
+            if 0 <= row < num_wells_y and 0 <= col < num_wells_x:
+                candidates.append((row, col))
+                relative_x.append(x - offset_x_mm - col * distance_x_mm - half_x_mm)
+                relative_y.append(y - offset_y_mm - row * distance_y_mm - half_y_mm)
+            else:
+                candidates.append(None)
+                relative_x.append(math.inf)
+                relative_y.append(math.inf)
+
+        inside = _points_in_rounded_rect(relative_x, relative_y, half_x_mm, half_y_mm, self.Well_edge_radius_mm)
+        return [candidate if is_inside else None for candidate, is_inside in zip(candidates, inside)]
+
+    def well_at(self, x_mm: float, y_mm: float) -> tp.Optional[tp.Tuple[int, int]]:
+        " (row,col) index of the well containing the point, or None. see wells_at "
+        return self.wells_at((x_mm,), (y_mm,))[0]
+
+    def get_valid_site_mask(self, grid: _SiteGrid, fov_x_mm: float = 0.0, fov_y_mm: float = 0.0) -> tp.Tuple[bool, ...]:
+        """
+        check for each site of grid (an AcquisitionWellSiteConfiguration, centered on the well center) if it fits into a
+        well of this plate, i.e. if a field of view of fov_x_mm by fov_y_mm around the site is entirely inside the well
+
+        returns one entry per site, in row-major order, i.e. the entry for site (row,col) is at index row*grid.num_x+col.
+        the result is cached per plate geometry and grid, so checking every protocol against its plate is cheap.
+        """
+
+        return _valid_site_mask(
+            self.Well_size_x_mm,
+            self.Well_size_y_mm,
+            self.Well_edge_radius_mm,
+            grid.num_x,
+            grid.delta_x_mm,
+            grid.num_y,
+            grid.delta_y_mm,
+            fov_x_mm,
+            fov_y_mm,
+        )
+
+class WellplateReference(BaseModel):
+    """
+    reference to a plate in the plate catalog (see seaconfig.plates.plate_registry), used in place of a full
+    Wellplate in a protocol (see AcquisitionConfig.model_dump_json_with_plate_reference)
+
+    on load, the reference resolves to the catalog plate with Model_id if its content_hash matches, otherwise to
+    fallback. if there is no matching catalog plate and no fallback, loading fails.
+
+    Fields:
+        Model_id:str - Model_id of the plate
+        content_hash:str - Wellplate.content_hash of the plate when the reference was written
+        fallback:tp.Optional[Wellplate] - full copy of the plate, used if the catalog plate does not match
+    """
+
+    Model_id: str
+    content_hash: str
+    fallback: tp.Optional[Wellplate] = None
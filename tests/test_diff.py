@@ -0,0 +1,133 @@
+import json
+
+import pytest
+
+from seaconfig import (
+    AcquisitionChannelConfig,
+    AcquisitionConfig,
+    AcquisitionWellSiteConfiguration,
+    AcquisitionWellSiteConfigurationDeltaTime,
+    AcquisitionWellSiteConfigurationSiteSelectionItem,
+    ConfigItem,
+    ConfigPatchOperation,
+    PlateWellConfig,
+    apply_patch,
+    diff_configs,
+    plate_registry,
+)
+
+def make_channel(handle: str, exposure_time_ms: float = 10) -> AcquisitionChannelConfig:
+    return AcquisitionChannelConfig(
+        name=handle,
+        handle=handle,
+        illum_perc=50,
+        exposure_time_ms=exposure_time_ms,
+        analog_gain=0,
+        z_offset_um=0,
+        num_z_planes=1,
+        delta_z_um=1,
+    )
+
+def make_config() -> AcquisitionConfig:
+    plate = plate_registry.find_by_num_wells(96)[0]
+    return AcquisitionConfig(
+        project_name="project",
+        plate_name="plate",
+        cell_line="none",
+        grid=AcquisitionWellSiteConfiguration(
+            num_x=2,
+            delta_x_mm=0.5,
+            num_y=2,
+            delta_y_mm=0.5,
+            num_t=1,
+            delta_t=AcquisitionWellSiteConfigurationDeltaTime(h=0, m=0, s=0),
+            mask=[
+                AcquisitionWellSiteConfigurationSiteSelectionItem(row=row, col=col, selected=True)
+                for row in range(2)
+                for col in range(2)
+            ],
+        ),
+        wellplate_type=plate,
+        plate_wells=[
+            PlateWellConfig(row=row, col=col, selected=False)
+            for row in range(plate.Num_wells_y)
+            for col in range(plate.Num_wells_x)
+        ],
+        channels=[make_channel("fluo405"), make_channel("fluo488"), make_channel("bfledfull")],
+        autofocus_enabled=False,
+        machine_config=[
+            ConfigItem(name="laser af", handle="laser_af", value_kind="float", value=1.0),
+            ConfigItem(name="comment", handle="comment", value_kind="text", value=""),
+        ],
+    )
+
+def round_trip(old: AcquisitionConfig, new: AcquisitionConfig) -> AcquisitionConfig:
+    " diff old and new, send the operations through json, and apply them to a copy of old "
+    ops = diff_configs(old, new)
+    data = json.dumps([op.model_dump(mode="json") for op in ops])
+    ops = [ConfigPatchOperation.model_validate(op) for op in json.loads(data)]
+
+    patched = old.model_copy(deep=True)
+    apply_patch(patched, ops)
+    return patched
+
+def test_no_changes():
+    config = make_config()
+    assert diff_configs(config, config.model_copy(deep=True)) == []
+
+def test_value_changes():
+    old = make_config()
+    new = old.model_copy(deep=True)
+    new.project_name = "other project"
+    new.grid.num_t = 5
+    new.plate_wells[13].selected = True
+    new.channels[1].exposure_time_ms = 25
+    new.machine_config[0].value = 2.5
+
+    ops = diff_configs(old, new)
+    assert len(ops) == 5
+    assert all(op.op == "set" for op in ops)
+    assert round_trip(old, new) == new
+
+def test_add_and_remove_items():
+    old = make_config()
+    new = old.model_copy(deep=True)
+    del new.channels[0]
+    new.channels.append(make_channel("fluo561"))
+    new.machine_config.append(ConfigItem(name="binning", handle="binning", value_kind="int", value=2))
+
+    assert round_trip(old, new) == new
+
+def test_reordered_channels():
+    old = make_config()
+    new = old.model_copy(deep=True)
+    new.channels.reverse()
+
+    ops = diff_configs(old, new)
+    assert [op.op for op in ops] == ["move"]
+    assert ops[0].path == ["channels"]
+    assert round_trip(old, new) == new
+
+def test_added_item_inserted_before_existing_items():
+    old = make_config()
+    new = old.model_copy(deep=True)
+    new.channels.insert(0, make_channel("fluo561"))
+    del new.channels[2]
+
+    assert round_trip(old, new) == new
+
+def test_reordered_wells():
+    old = make_config()
+    new = old.model_copy(deep=True)
+    new.plate_wells.reverse()
+    new.plate_wells[0].selected = True
+    new.grid.mask.reverse()
+
+    assert round_trip(old, new) == new
+
+def test_invalid_move():
+    config = make_config()
+    with pytest.raises(ValueError):
+        apply_patch(config, [ConfigPatchOperation(op="move", path=["channels"], value=["fluo405", "fluo488"])])
+    with pytest.raises(ValueError):
+        apply_patch(config, [ConfigPatchOperation(op="move", path=["project_name"], value=[])])
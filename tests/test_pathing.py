@@ -0,0 +1,45 @@
+import pytest
+
+from seaconfig import (
+    PATH_STRATEGIES,
+    AcquisitionPlan,
+    AcquisitionWellSiteConfiguration,
+    AcquisitionWellSiteConfigurationDeltaTime,
+    AcquisitionWellSiteConfigurationSiteSelectionItem,
+    compare_path_strategies,
+    optimize_plan,
+    order_positions,
+    plate_registry,
+)
+
+def make_grid() -> AcquisitionWellSiteConfiguration:
+    return AcquisitionWellSiteConfiguration(
+        num_x=2,
+        delta_x_mm=0.5,
+        num_y=2,
+        delta_y_mm=0.5,
+        num_t=1,
+        delta_t=AcquisitionWellSiteConfigurationDeltaTime(h=0, m=0, s=0),
+        mask=[
+            AcquisitionWellSiteConfigurationSiteSelectionItem(row=row, col=col, selected=False)
+            for row in range(2)
+            for col in range(2)
+        ],
+    )
+
+@pytest.mark.parametrize("strategy", PATH_STRATEGIES)
+def test_order_no_positions(strategy):
+    assert order_positions([], [], [], strategy=strategy) == []
+
+@pytest.mark.parametrize("wells, sites", [([], []), ([(0, 0), (1, 1)], []), ([], [(0, 0), (1, 1)])])
+def test_empty_selection(wells, sites):
+    plate = plate_registry.find_by_num_wells(96)[0]
+    plan = AcquisitionPlan(plate, make_grid(), wells, sites)
+
+    for strategy in PATH_STRATEGIES:
+        optimized = optimize_plan(plan, strategy)
+        assert sorted(optimized.wells) == sorted(wells)
+        assert sorted(optimized.sites) == sorted(sites)
+
+    distances = compare_path_strategies(plan)
+    assert set(distances) == {"unchanged", *PATH_STRATEGIES}
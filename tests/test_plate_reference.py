@@ -0,0 +1,25 @@
+from test_diff import make_config
+
+from seaconfig import AcquisitionConfig, plate_registry
+
+def test_roundtrip_non_ascii():
+    config = make_config()
+    config.comment = "Zellen gefärbt mit DAPI, 37 °C, µm-Raster ✓"
+    config.cell_line = "HeLa – Kontrolle"
+
+    data = config.model_dump_json_with_plate_reference()
+    assert "gefärbt" in data and "✓" in data
+    assert '"content_hash"' in data
+    assert len(data) < len(config.model_dump_json())
+
+    loaded = AcquisitionConfig.model_validate_json(data)
+    assert loaded == config
+
+def test_resolved_plate_is_a_copy():
+    config = make_config()
+    loaded = AcquisitionConfig.model_validate_json(config.model_dump_json_with_plate_reference())
+
+    model_id = loaded.wellplate_type.Model_id
+    num_wells_x = plate_registry[model_id].Num_wells_x
+    loaded.wellplate_type.Num_wells_x = num_wells_x + 1
+    assert plate_registry[model_id].Num_wells_x == num_wells_x
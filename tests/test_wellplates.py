@@ -0,0 +1,21 @@
+import pytest
+
+from seaconfig import plate_registry
+
+@pytest.mark.parametrize("plate", list(plate_registry), ids=lambda plate: plate.Model_id)
+def test_well_at_well_centers(plate):
+    wells = [(row, col) for row in range(plate.Num_wells_y) for col in range(plate.Num_wells_x)]
+    xs_mm = []
+    ys_mm = []
+    for well in wells:
+        x_min, y_min, x_max, y_max = plate.get_well_bounds(well)
+        xs_mm.append((x_min + x_max) / 2)
+        ys_mm.append((y_min + y_max) / 2)
+
+    assert plate.wells_at(xs_mm, ys_mm) == wells
+    assert plate.well_at(xs_mm[0], ys_mm[0]) == wells[0]
+
+@pytest.mark.parametrize("plate", list(plate_registry), ids=lambda plate: plate.Model_id)
+def test_well_at_outside_of_plate(plate):
+    assert plate.well_at(-1000.0, -1000.0) is None
+    assert plate.well_at(plate.Length_mm + 1000.0, plate.Width_mm + 1000.0) is None